@@ -296,3 +296,37 @@ class Parser(object):
 def parse_expression(expression, doc_dict):
     """Parse an expression."""
     return Parser(doc_dict).parse(expression)
+
+
+def compile_expression(expression):
+    """Compile an expression into a callable taking the document.
+
+    The expression structure is inspected once here instead of for every
+    document: field references become pre-built getters, literals become
+    constants and plain nested dicts become dicts of compiled getters.
+    Operator expressions keep going through the Parser, whose dispatch
+    depends on per-document values.
+    """
+    if not isinstance(expression, dict):
+        if isinstance(expression, six.string_types) and expression.startswith("$"):
+            return helpers.embedded_item_getter(expression.replace("$", ""))
+
+        def constant(unused_doc_dict):
+            return expression
+
+        return constant
+
+    for key in expression:
+        if isinstance(key, six.string_types) and key.startswith("$"):
+
+            def parse(doc_dict):
+                return Parser(doc_dict).parse(expression)
+
+            return parse
+
+    compiled_dict = {k: compile_expression(v) for k, v in six.iteritems(expression)}
+
+    def parse_value_dict(doc_dict):
+        return {k: getter(doc_dict) for k, getter in six.iteritems(compiled_dict)}
+
+    return parse_value_dict
@@ -1,6 +1,6 @@
 from __future__ import division
 import bisect
-from collections import OrderedDict
+from collections import namedtuple, OrderedDict
 try:
 	from collections.abc import Mapping, MutableMapping, Iterable
 except ImportError:
@@ -8,10 +8,13 @@ except ImportError:
 import copy
 from datetime import datetime
 import functools
+import heapq
 import itertools
 import json
 import math
+import operator
 import random
+import sys
 import threading
 import time
 import types
@@ -21,6 +24,10 @@ try:
     from bson import json_util, SON, BSON
 except ImportError:
     json_utils = SON = BSON = None
+try:
+    from bson.errors import InvalidDocument
+except ImportError:
+    InvalidDocument = None
 try:
     import execjs
 except ImportError:
@@ -41,7 +48,6 @@ except ImportError:
 
 from sentinels import NOTHING
 from six import iteritems
-from six import iterkeys
 from six import itervalues
 from six import MAXSIZE
 from six import string_types
@@ -51,6 +57,7 @@ from six import text_type
 from mongomock import aggregate
 from mongomock.command_cursor import CommandCursor
 from mongomock import ConfigurationError, DuplicateKeyError, BulkWriteError
+from mongomock.filtering import compile_filter
 from mongomock.filtering import filter_applies
 from mongomock.filtering import iter_key_candidates
 from mongomock.filtering import resolve_sort_key
@@ -69,6 +76,182 @@ from mongomock import WriteError
 lock = threading.RLock()
 _random = random.Random()
 
+# Plain dict preserves insertion order since Python 3.7 and is faster than
+# OrderedDict, which keeps an extra doubly-linked list per instance.
+_ordered_dict = dict if sys.version_info >= (3, 7) else OrderedDict
+
+
+_IMMUTABLE_LEAF_TYPES = (type(None), bool, int, float, str, bytes, datetime, ObjectId)
+
+# Entries kept per collection in the materialized-query cache.
+_QUERY_CACHE_SIZE = 64
+
+
+def _fast_clone(value):
+    """Deep-copy a BSON-shaped value without the copy.deepcopy machinery.
+
+    BSON payloads only hold dicts, lists and immutable leaves, so a direct
+    recursive rebuild is much cheaper than copy.deepcopy's memo handling.
+    Anything unexpected still falls back to copy.deepcopy.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return {k: _fast_clone(v) for k, v in iteritems(value)}
+    if value_type is list:
+        return [_fast_clone(item) for item in value]
+    if value_type is tuple:
+        return tuple(_fast_clone(item) for item in value)
+    if value_type in _IMMUTABLE_LEAF_TYPES:
+        return value
+    return copy.deepcopy(value)
+
+
+def _store_id(doc_id):
+    """Return the hashable key under which a document is stored.
+
+    Dict _ids are keyed by their hashdict form; everything else is stored
+    under the _id value itself.
+    """
+    if isinstance(doc_id, dict):
+        return helpers.hashdict(doc_id)
+    return doc_id
+
+
+def _validate_keys(doc):
+    """Validate document keys the way BSON.encode(doc, check_keys=True) does.
+
+    A cheap iterative walk replaces the full serialization round-trip.
+    Values of types the walk does not know about are handed to BSON.encode
+    so pymongo's exact error behavior is kept for them.
+    """
+    stack = [doc]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            for k, v in iteritems(value):
+                if not isinstance(k, string_types):
+                    raise InvalidDocument(
+                        "documents must have only string keys, key was %r" % (k,)
+                    )
+                if k.startswith("$"):
+                    raise InvalidDocument("key '%s' must not start with '$'" % k)
+                if "." in k:
+                    raise InvalidDocument("key '%s' must not contain '.'" % k)
+                stack.append(v)
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif not isinstance(value, _IMMUTABLE_LEAF_TYPES) and not isinstance(
+            value, helpers.RE_TYPE
+        ):
+            # Let bson accept or reject types the walk does not know about
+            # (like UUID or Decimal128) with its own error message.
+            BSON.encode({"v": value})
+
+
+def _make_hashable(value):
+    """Convert a document value into a hashable key for unique-index maps.
+
+    Dict values are converted recursively: hashdict only shallow-converts
+    its own values, so a list nested inside a dict would otherwise keep
+    its unhashable dict elements.
+    """
+    if isinstance(value, dict):
+        return helpers.hashdict(
+            (key, _make_hashable(item)) for key, item in iteritems(value)
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(_make_hashable(item) for item in value)
+    return value
+
+
+def _freeze_for_cache(value):
+    """Convert a query component into a hashable, order-preserving form.
+
+    Unlike _make_hashable, key order stays significant: projections with
+    reordered refinements do not mean the same thing and must not share a
+    cache entry.
+    """
+    if isinstance(value, dict):
+        return ("d",) + tuple(
+            (key, _freeze_for_cache(item)) for key, item in iteritems(value)
+        )
+    if isinstance(value, (list, tuple)):
+        return ("l",) + tuple(_freeze_for_cache(item) for item in value)
+    return value
+
+
+def _add_to_set(existing, candidates):
+    """Append candidates to the existing list, skipping duplicates.
+
+    Membership is tracked with a set of the hashable elements so large
+    $each payloads stay linear; unhashable elements (like dicts) fall
+    back to a scan of the list itself.
+    """
+    try:
+        seen = set(existing)
+    except TypeError:
+        seen = None
+    for obj in candidates:
+        if seen is None:
+            if obj not in existing:
+                existing.append(obj)
+            continue
+        try:
+            is_new = obj not in seen
+        except TypeError:
+            is_new = obj not in existing
+        else:
+            if is_new:
+                seen.add(obj)
+        if is_new:
+            existing.append(obj)
+    return existing
+
+
+def _compile_update(document):
+    """Pre-resolve the operators of an update document into a plan.
+
+    Each entry is (updater, operator, value, positional) with updater being
+    the matching function from _updaters, or None for the operators handled
+    explicitly in _apply_update_operators. positional records whether any
+    field path contains a '$' placeholder, so the per-document loop skips
+    the positional machinery for plain updates without re-scanning keys.
+    """
+    return [
+        (
+            _updaters.get(k),
+            k,
+            v,
+            isinstance(v, dict)
+            and any(
+                isinstance(key, string_types) and "$" in key for key in v
+            ),
+        )
+        for k, v in iteritems(document)
+    ]
+
+
+def _pull_all(arr, values):
+    """Return arr without the elements present in values.
+
+    Membership is checked against a set when the values are hashable so
+    large pulls stay linear; unhashable elements fall back to scanning
+    the original list.
+    """
+    try:
+        value_set = set(values)
+    except TypeError:
+        return [obj for obj in arr if obj not in values]
+    result = []
+    for obj in arr:
+        try:
+            is_kept = obj not in value_set
+        except TypeError:
+            is_kept = obj not in values
+        if is_kept:
+            result.append(obj)
+    return result
+
 
 def validate_is_mapping(option, value):
     if not isinstance(value, Mapping):
@@ -110,62 +293,142 @@ def validate_write_concern_params(**params):
         WriteConcern(**params)
 
 
-def get_value_by_dot(doc, key):
-    """Get dictionary value using dotted key"""
-    result = doc
-    for key_item in key.split("."):
-        if isinstance(result, dict):
-            result = result[key_item]
+@helpers.lru_cache(maxsize=4096)
+def _split_dotted(key):
+    """Split a dotted key into its parts, memoized across calls.
 
-        elif isinstance(result, (list, tuple)):
-            try:
-                result = result[int(key_item)]
-            except (ValueError, IndexError):
+    The same handful of dotted keys gets re-split for every document in
+    update and filter passes, so cache the parts. The cache is capped to
+    avoid unbounded growth from adversarial keys.
+    """
+    return tuple(key.split("."))
+
+
+@helpers.lru_cache(maxsize=4096)
+def _rsplit_dotted(key):
+    """Split a dotted key into (parent, child), memoized across calls.
+
+    Returns (None, key) when the key contains no dot.
+    """
+    parent_key, sep, child_key = key.rpartition(".")
+    if not sep:
+        return None, key
+    return parent_key, child_key
+
+
+_PathAccessor = namedtuple("_PathAccessor", ["get", "set", "has", "delete"])
+
+# A projection normalized once per query; see Collection._compile_projection.
+_CompiledProjection = namedtuple(
+    "_CompiledProjection",
+    [
+        "id_value",
+        "is_include",
+        "has_fields",
+        "flat_keys",
+        "combined_spec",
+        "projection_operators",
+    ],
+)
+
+
+@helpers.lru_cache(maxsize=4096)
+def _compile_path(key):
+    """Compile a dotted key into traversal closures, memoized per path.
+
+    The per-segment work (integer parsing for list indices, parent/child
+    splitting) is done once here instead of on every document, so the
+    closures only dispatch on the runtime type of each level.
+    """
+    steps = []
+    for part in _split_dotted(key):
+        try:
+            steps.append((part, int(part)))
+        except ValueError:
+            steps.append((part, None))
+
+    def get(doc):
+        result = doc
+        for part, index in steps:
+            if isinstance(result, dict):
+                result = result[part]
+
+            elif isinstance(result, (list, tuple)):
+                if index is None:
+                    raise KeyError()
+                try:
+                    result = result[index]
+                except IndexError:
+                    raise KeyError()
+
+            else:
                 raise KeyError()
 
+        return result
+
+    parent_key, child_key = _rsplit_dotted(key)
+    try:
+        child_index = int(child_key)
+    except ValueError:
+        child_index = None
+
+    def set(doc, value):
+        if parent_key is None:
+            parent = doc
+        else:
+            parent = get_value_by_dot(doc, parent_key)
+
+        if isinstance(parent, dict):
+            parent[child_key] = value
+        elif isinstance(parent, (list, tuple)):
+            if child_index is None:
+                raise KeyError()
+            try:
+                parent[child_index] = value
+            except IndexError:
+                raise KeyError()
         else:
             raise KeyError()
 
-    return result
+        return doc
 
+    def has(doc):
+        sub_doc = doc
+        for part, unused_index in steps:
+            if part not in sub_doc:
+                return False
+            sub_doc = sub_doc[part]
+        return True
 
-def set_value_by_dot(doc, key, value):
-    """Set dictionary value using dotted key"""
-    try:
-        parent_key, child_key = key.rsplit(".", 1)
-        parent = get_value_by_dot(doc, parent_key)
-    except ValueError:
-        child_key = key
-        parent = doc
+    def delete(doc):
+        if parent_key is None:
+            parent = doc
+        else:
+            parent = get_value_by_dot(doc, parent_key)
 
-    if isinstance(parent, dict):
-        parent[child_key] = value
-    elif isinstance(parent, (list, tuple)):
-        try:
-            parent[int(child_key)] = value
-        except (ValueError, IndexError):
+        if isinstance(parent, dict):
+            del parent[child_key]
+        else:
             raise KeyError()
-    else:
-        raise KeyError()
 
-    return doc
+        return doc
 
+    return _PathAccessor(get, set, has, delete)
 
-def delete_value_by_dot(doc, key):
-    """Delete dictionary value using dotted key"""
-    try:
-        parent_key, child_key = key.rsplit(".", 1)
-        parent = get_value_by_dot(doc, parent_key)
-    except ValueError:
-        child_key = key
-        parent = doc
 
-    if isinstance(parent, dict):
-        del parent[child_key]
-    else:
-        raise KeyError()
+def get_value_by_dot(doc, key):
+    """Get dictionary value using dotted key"""
+    return _compile_path(key).get(doc)
+
+
+def set_value_by_dot(doc, key, value):
+    """Set dictionary value using dotted key"""
+    return _compile_path(key).set(doc, value)
 
-    return doc
+
+def delete_value_by_dot(doc, key):
+    """Delete dictionary value using dotted key"""
+    return _compile_path(key).delete(doc)
 
 
 class BulkWriteOperation(object):
@@ -245,10 +508,25 @@ def _combine_projection_spec(projection_fields_spec):
 
     e.g: {'a': 1, 'b.c': 1, 'b.d': 1} => {'a': 1, 'b': {'c': 1, 'd': 1}}
     """
+    try:
+        return _combine_projection_spec_cached(
+            tuple(iteritems(projection_fields_spec))
+        )
+    except TypeError:
+        # Unhashable values in the spec cannot be used as a cache key.
+        return _combine_projection_spec_uncached(projection_fields_spec)
+
+
+@helpers.lru_cache(maxsize=512)
+def _combine_projection_spec_cached(projection_fields_items):
+    return _combine_projection_spec_uncached(OrderedDict(projection_fields_items))
+
 
+def _combine_projection_spec_uncached(projection_fields_spec):
     tmp_spec = OrderedDict()
     for f, v in iteritems(projection_fields_spec):
-        if "." not in f:
+        base_field, sep, new_field = f.partition(".")
+        if not sep:
             if isinstance(tmp_spec.get(f), dict) and not v:
                 raise NotImplementedError(
                     "Mongomock does not support overriding excluding projection: %s"
@@ -256,8 +534,6 @@ def _combine_projection_spec(projection_fields_spec):
                 )
             tmp_spec[f] = v
         else:
-            split_field = f.split(".", 1)
-            base_field, new_field = tuple(split_field)
             if not isinstance(tmp_spec.get(base_field), dict):
                 tmp_spec[base_field] = OrderedDict()
             tmp_spec[base_field][new_field] = v
@@ -265,7 +541,7 @@ def _combine_projection_spec(projection_fields_spec):
     combined_spec = OrderedDict()
     for f, v in iteritems(tmp_spec):
         if isinstance(v, dict):
-            combined_spec[f] = _combine_projection_spec(v)
+            combined_spec[f] = _combine_projection_spec_uncached(v)
         else:
             combined_spec[f] = v
 
@@ -273,16 +549,41 @@ def _combine_projection_spec(projection_fields_spec):
 
 
 def _project_by_spec(doc, combined_projection_spec, is_include, container):
+    if is_include:
+        return _project_by_spec_include(doc, combined_projection_spec, container)
+    return _project_by_spec_exclude(doc, combined_projection_spec, container)
+
+
+def _project_by_spec_include(doc, combined_projection_spec, container):
     doc_copy = container()
 
-    if not is_include:
-        for key, val in iteritems(doc):
-            doc_copy[key] = val
+    for key, spec in combined_projection_spec.items():
+        if key == '$':
+            raise NotImplementedError('Positional projection is not implemented in mongomock')
+        if key not in doc:
+            continue
 
-    for key, spec in iteritems(combined_projection_spec):
+        if isinstance(spec, dict):
+            sub = doc[key]
+            if isinstance(sub, (list, tuple)):
+                doc_copy[key] = [
+                    _project_by_spec_include(sub_doc, spec, container)
+                    for sub_doc in sub
+                ]
+            elif isinstance(sub, dict):
+                doc_copy[key] = _project_by_spec_include(sub, spec, container)
+        else:
+            doc_copy[key] = doc[key]
+
+    return doc_copy
+
+
+def _project_by_spec_exclude(doc, combined_projection_spec, container):
+    doc_copy = container()
+    doc_copy.update(doc)
+
+    for key, spec in combined_projection_spec.items():
         if key == '$':
-            if is_include:
-                raise NotImplementedError('Positional projection is not implemented in mongomock')
             raise OperationFailure('Cannot exclude array elements with the positional operator')
         if key not in doc:
             continue
@@ -291,16 +592,13 @@ def _project_by_spec(doc, combined_projection_spec, is_include, container):
             sub = doc[key]
             if isinstance(sub, (list, tuple)):
                 doc_copy[key] = [
-                    _project_by_spec(sub_doc, spec, is_include, container)
+                    _project_by_spec_exclude(sub_doc, spec, container)
                     for sub_doc in sub
                 ]
             elif isinstance(sub, dict):
-                doc_copy[key] = _project_by_spec(sub, spec, is_include, container)
+                doc_copy[key] = _project_by_spec_exclude(sub, spec, container)
         else:
-            if is_include:
-                doc_copy[key] = doc[key]
-            else:
-                doc_copy.pop(key, None)
+            doc_copy.pop(key, None)
 
     return doc_copy
 
@@ -319,10 +617,22 @@ class BulkOperationBuilder(object):
         return BulkWriteOperation(self, selector)
 
     def insert(self, doc):
+        # Consecutive inserts share a single executor, skipping one
+        # closure and result-aggregation round-trip per document.
+        previous = self.executors[-1] if self.executors else None
+        batch = getattr(previous, "_insert_batch", None)
+        if batch is not None:
+            batch.append(doc)
+            return
+
+        batch = [doc]
+
         def exec_insert():
-            self.collection.insert(doc)
-            return {"nInserted": 1}
+            for document in batch:
+                self.collection._insert(document)
+            return {"nInserted": len(batch)}
 
+        exec_insert._insert_batch = batch
         self.executors.append(exec_insert)
 
     def __aggregate_operation_result(self, total_result, key, value):
@@ -413,14 +723,87 @@ class BulkOperationBuilder(object):
         write_operation.register_remove_op(not just_one)
 
 
+# JS programs used by map_reduce and group; compiled at most once per
+# (program, user function) pair via _compile_js instead of once per call.
+# The user function is spliced in at compile time, so it is evaluated once
+# instead of once per invocation, and the documents arrive as one JSON
+# array string parsed in a single step rather than one eval per document.
+_DO_MAP_JS = """
+    var mapper = (@@FUNC@@);
+    function doMap(docsJson) {
+        var mappedDict = {};
+        function emit(key, val) {
+            if (key['$oid']) {
+                mapped_key = '$oid' + key['$oid'];
+            }
+            else {
+                mapped_key = key;
+            }
+            if(!mappedDict[mapped_key]) {
+                mappedDict[mapped_key] = [];
+            }
+            mappedDict[mapped_key].push(val);
+        }
+        var docList = JSON.parse(docsJson);
+        for(var i=0; i<docList.length; i++) {
+            var mappedVal = (mapper).call(docList[i]);
+        }
+        return mappedDict;
+    }
+"""
+
+_DO_REDUCE_JS = """
+    var reducer = (@@FUNC@@);
+    function doReduce(docList) {
+        var reducedList = new Array();
+        for(var key in docList) {
+            var reducedVal = {'_id': key,
+                    'value': reducer(key, docList[key])};
+            reducedList.push(reducedVal);
+        }
+        return reducedList;
+    }
+"""
+
+_GROUP_DO_REDUCE_JS = """
+    var reducer = (@@FUNC@@);
+    function doReduce(docList) {
+        for(var i=0, l=docList.length; i<l; i++) {
+            try {
+                reducedVal = reducer(docList[i-1], docList[i]);
+            }
+            catch (err) {
+                continue;
+            }
+        }
+    return docList[docList.length - 1];
+    }
+"""
+
+
+@helpers.lru_cache(maxsize=None)
+def _compile_js(source, func=None):
+    if func is not None:
+        # Plain replace rather than %-formatting: user functions routinely
+        # contain '%' (the JS modulo operator).
+        source = source.replace("@@FUNC@@", func)
+    return execjs.compile(source)
+
+
 class Collection(object):
     def __init__(self, database, name, create=False, write_concern=None):
         self.name = name
         self.full_name = "{0}.{1}".format(database.name, name)
         self.database = database
-        self._documents = OrderedDict()
+        self._documents = _ordered_dict()
+        # Materialized results of recent queries, keyed by query shape and
+        # cleared on every write so only current data is served from it.
+        self._query_cache = _ordered_dict()
         self._force_created = create
         self._write_concern = write_concern or WriteConcern()
+        # When False, unprojected find() results may alias the stored
+        # documents instead of being copied; callers must not mutate them.
+        self._copy_on_read = True
         self._uniques = {}
         self._index_information = {
             "_id_": {"v": 1, "key": [("_id", 1)], "ns": self.full_name}
@@ -429,6 +812,10 @@ class Collection(object):
     def _is_created(self):
         return self._documents or self._uniques or self._force_created
 
+    def _invalidate_query_cache(self):
+        if self._query_cache:
+            self._query_cache.clear()
+
     def __repr__(self):
         return "Collection({0}, '{1}')".format(self.database, self.name)
 
@@ -466,37 +853,49 @@ class Collection(object):
     def insert_many(self, documents, ordered=True, session=None):
         if not isinstance(documents, Iterable) or not documents:
             raise TypeError("documents must be a non-empty list")
-        for document in documents:
-            validate_is_mutable_mapping("document", document)
+        if not isinstance(documents, (list, types.GeneratorType)):
+            documents = list(documents)
         return InsertManyResult(self._insert(documents, session), acknowledged=True)
 
     def _insert(self, data, session=None):
         if session:
             raise NotImplementedError("Mongomock does not handle sessions yet")
         if isinstance(data, list) or isinstance(data, types.GeneratorType):
-            results = []
-            for index, item in enumerate(data):
-                try:
-                    results.append(self._insert(item))
-                except DuplicateKeyError:
-                    raise BulkWriteError(
-                        {
-                            "writeErrors": [
-                                {
-                                    "index": index,
-                                    "code": 11000,
-                                    "errmsg": "E11000 duplicate key error",
-                                    "op": item,
-                                }
-                            ],
-                            "nInserted": index,
-                        }
-                    )
-            return results
+            is_generator = isinstance(data, types.GeneratorType)
+            if not is_generator:
+                # Validate the whole batch up front so a bad document
+                # aborts the operation before anything is inserted;
+                # generators can only be validated as they are consumed.
+                for item in data:
+                    validate_is_mutable_mapping("document", item)
+            # Hold the lock once for the whole batch; the per-document
+            # inserts below re-enter it without contention.
+            with lock:
+                results = []
+                for index, item in enumerate(data):
+                    if is_generator:
+                        validate_is_mutable_mapping("document", item)
+                    try:
+                        results.append(self._insert(item))
+                    except DuplicateKeyError:
+                        raise BulkWriteError(
+                            {
+                                "writeErrors": [
+                                    {
+                                        "index": index,
+                                        "code": 11000,
+                                        "errmsg": "E11000 duplicate key error",
+                                        "op": item,
+                                    }
+                                ],
+                                "nInserted": index,
+                            }
+                        )
+                return results
 
         # Like pymongo, we should fill the _id in the inserted dict (odd behavior,
         # but we need to stick to it), so we must patch in-place the data dict
-        for key in data.keys():
+        for key in data:
             data[key] = helpers.patch_datetime_awareness_in_document(data[key])
 
         if not all(isinstance(k, string_types) for k in data):
@@ -504,52 +903,74 @@ class Collection(object):
 
         if BSON:
             # bson validation
-            BSON.encode(data, check_keys=True)
+            _validate_keys(data)
 
         if "_id" not in data:
             data["_id"] = ObjectId()
-        object_id = data["_id"]
-        if isinstance(object_id, dict):
-            object_id = helpers.hashdict(object_id)
+        object_id = _store_id(data["_id"])
         if object_id in self._documents:
             raise DuplicateKeyError("E11000 Duplicate Key Error", 11000)
         with lock:
             self._documents[object_id] = self._internalize_dict(data)
-        try:
-            self._ensure_uniques(data)
-        except DuplicateKeyError:
-            # Rollback
-            del self._documents[object_id]
-            raise
+        self._invalidate_query_cache()
+        # The common case has no unique indexes, skip the check entirely.
+        if self._uniques:
+            try:
+                # Reuse the store key computed above rather than re-hashing
+                # the _id.
+                self._ensure_uniques(data, object_id)
+            except DuplicateKeyError:
+                # Rollback
+                del self._documents[object_id]
+                raise
         return data["_id"]
 
-    def _ensure_uniques(self, new_data):
+    def _ensure_uniques(self, new_data, doc_id=None):
         # Note we consider new_data is already inserted in db
-        for unique, is_sparse in self._uniques.values():
+        if doc_id is None:
+            doc_id = _store_id(new_data.get("_id"))
+        registrations = []
+        for unique, is_sparse, value_map, id_map in self._uniques.values():
             find_kwargs = {}
             for key, direction in unique:
                 try:
                     find_kwargs[key] = get_value_by_dot(new_data, key)
                 except KeyError:
                     find_kwargs[key] = None
-            answer_count = len(list(self._iter_documents(find_kwargs)))
-            if answer_count > 1 and not (is_sparse and find_kwargs[key] is None):
-                raise DuplicateKeyError("E11000 Duplicate Key Error", 11000)
+            try:
+                index_key = tuple(
+                    _make_hashable(find_kwargs[key]) for key, direction in unique
+                )
+            except TypeError:
+                # Values that cannot be hashed cannot use the index map, so
+                # fall back to scanning the documents.
+                answer_count = len(list(self._iter_documents(find_kwargs)))
+                if answer_count > 1 and not (is_sparse and find_kwargs[key] is None):
+                    raise DuplicateKeyError("E11000 Duplicate Key Error", 11000)
+                continue
+            is_sparse_miss = is_sparse and find_kwargs[key] is None
+            if not is_sparse_miss:
+                existing_id = value_map.get(index_key, NOTHING)
+                if existing_id is not NOTHING and existing_id != doc_id:
+                    raise DuplicateKeyError("E11000 Duplicate Key Error", 11000)
+            registrations.append((value_map, id_map, index_key, is_sparse_miss))
+        # All unique indexes verified, record the new values in the maps.
+        for value_map, id_map, index_key, is_sparse_miss in registrations:
+            old_key = id_map.pop(doc_id, NOTHING)
+            if old_key is not NOTHING and value_map.get(old_key) == doc_id:
+                del value_map[old_key]
+            if not is_sparse_miss:
+                value_map[index_key] = doc_id
+                id_map[doc_id] = index_key
 
     def _internalize_dict(self, d):
-        return {k: copy.deepcopy(v) for k, v in iteritems(d)}
+        return {k: _fast_clone(v) for k, v in iteritems(d)}
 
     def _has_key(self, doc, key):
-        key_parts = key.split(".")
-        sub_doc = doc
-        for part in key_parts:
-            if part not in sub_doc:
-                return False
-            sub_doc = sub_doc[part]
-        return True
+        return _compile_path(key).has(doc)
 
     def _remove_key(self, doc, key):
-        key_parts = key.split(".")
+        key_parts = _split_dotted(key)
         sub_doc = doc
         for part in key_parts[:-1]:
             sub_doc = sub_doc[part]
@@ -617,320 +1038,358 @@ class Collection(object):
         updated_existing = False
         upserted_id = None
         num_updated = 0
-        for existing_document in itertools.chain(self._iter_documents(spec), [None]):
-            # we need was_insert for the setOnInsert update operation
-            was_insert = False
-            # the sentinel document means we should do an upsert
-            if existing_document is None:
-                if not upsert or num_updated:
-                    continue
-                # For upsert operation we have first to create a fake existing_document,
-                # update it like a regular one, then finally insert it
-                if spec.get("_id") is not None:
-                    _id = spec["_id"]
-                elif document.get("_id") is not None:
-                    _id = document["_id"]
-                else:
-                    _id = ObjectId()
-                to_insert = dict(spec, _id=_id)
-                to_insert = self._expand_dots(to_insert)
-                existing_document = to_insert
-                was_insert = True
+        # Resolve the update operators once; the plan is reused for every
+        # matched document instead of re-dispatching per document.
+        update_plan = _compile_update(document)
+        self._invalidate_query_cache()
+        for existing_document in self._iter_documents(spec):
+            original_document_snapshot = copy.deepcopy(existing_document)
+            updated_existing = True
+            num_updated += 1
+            self._apply_update_operators(existing_document, document, spec, update_plan)
+            # Document has been modified in-place, last thing is to make sure it
+            # still respect the unique indexes and if not to revert modifications
+            if self._uniques:
+                try:
+                    self._ensure_uniques(existing_document)
+                except DuplicateKeyError:
+                    # Rollback
+                    self._documents[
+                        original_document_snapshot["_id"]
+                    ] = original_document_snapshot
+                    raise
+
+            if not multi:
+                break
+
+        if not num_updated and upsert:
+            # For upsert operation we have first to create a fake existing_document,
+            # update it like a regular one, then finally insert it
+            if spec.get("_id") is not None:
+                _id = spec["_id"]
+            elif document.get("_id") is not None:
+                _id = document["_id"]
             else:
-                original_document_snapshot = copy.deepcopy(existing_document)
-                updated_existing = True
+                _id = ObjectId()
+            to_insert = dict(spec, _id=_id)
+            to_insert = self._expand_dots(to_insert)
+            self._apply_update_operators(
+                to_insert, document, spec, update_plan, was_insert=True
+            )
+            upserted_id = self._insert(to_insert)
             num_updated += 1
-            first = True
-            subdocument = None
-            for k, v in iteritems(document):
-                if k in _updaters.keys():
-                    updater = _updaters[k]
-                    subdocument = self._update_document_fields_with_positional_awareness(
+
+        return {
+            text_type("connectionId"): self.database.client._id,
+            text_type("err"): None,
+            text_type("n"): num_updated,
+            text_type("nModified"): num_updated if updated_existing else 0,
+            text_type("ok"): 1,
+            text_type("upserted"): upserted_id,
+            text_type("updatedExisting"): updated_existing,
+        }
+
+    def _apply_update_operators(
+        self, existing_document, document, spec, update_plan=None, was_insert=False
+    ):
+        """Apply the operators of an update document to one matched document.
+
+        update_plan is the pre-resolved operator list built by
+        _compile_update; passing it in lets multi-document updates pay the
+        dispatch cost once instead of once per matched document.
+        """
+        if update_plan is None:
+            update_plan = _compile_update(document)
+        first = True
+        subdocument = None
+        # Positional array resolutions, keyed by dotted-path tuple; filled
+        # lazily so each path's $elemMatch scan runs at most once per
+        # matched document.
+        positional_resolutions = {}
+        for updater, k, v, positional in update_plan:
+            if updater is not None:
+                if positional:
+                    subdocument = self._update_document_fields_positional(
                         existing_document, v, spec, updater, subdocument
                     )
+                else:
+                    self._update_document_fields(existing_document, v, updater)
 
-                elif k == "$rename":
-                    for src, dst in iteritems(v):
-                        if "." in src or "." in dst:
-                            raise NotImplementedError(
-                                "Using the $rename operator with dots is a valid MongoDB "
-                                "operation, but it is not yet supported by mongomock"
-                            )
-                        if self._has_key(existing_document, src):
-                            existing_document[dst] = existing_document.pop(src)
+            elif k == "$rename":
+                for src, dst in iteritems(v):
+                    if "." in src or "." in dst:
+                        raise NotImplementedError(
+                            "Using the $rename operator with dots is a valid MongoDB "
+                            "operation, but it is not yet supported by mongomock"
+                        )
+                    if self._has_key(existing_document, src):
+                        existing_document[dst] = existing_document.pop(src)
 
-                elif k == "$setOnInsert":
-                    if not was_insert:
-                        continue
-                    subdocument = self._update_document_fields_with_positional_awareness(
+            elif k == "$setOnInsert":
+                if not was_insert:
+                    continue
+                if positional:
+                    subdocument = self._update_document_fields_positional(
                         existing_document, v, spec, _set_updater, subdocument
                     )
+                else:
+                    self._update_document_fields(existing_document, v, _set_updater)
 
-                elif k == "$currentDate":
-                    for value in itervalues(v):
-                        if value == {"$type": "timestamp"}:
-                            raise NotImplementedError(
-                                "timestamp is not supported so far"
-                            )
+            elif k == "$currentDate":
+                for value in itervalues(v):
+                    if value == {"$type": "timestamp"}:
+                        raise NotImplementedError(
+                            "timestamp is not supported so far"
+                        )
 
-                    subdocument = self._update_document_fields_with_positional_awareness(
+                if positional:
+                    subdocument = self._update_document_fields_positional(
                         existing_document, v, spec, _current_date_updater, subdocument
                     )
+                else:
+                    self._update_document_fields(
+                        existing_document, v, _current_date_updater
+                    )
 
-                elif k == "$addToSet":
-                    for field, value in iteritems(v):
-                        nested_field_list = field.rsplit(".")
-                        if len(nested_field_list) == 1:
-                            if field not in existing_document:
-                                existing_document[field] = []
-                            # document should be a list append to it
-                            if isinstance(value, dict):
-                                if "$each" in value:
-                                    # append the list to the field
-                                    existing_document[field] += [
-                                        obj
-                                        for obj in list(value["$each"])
-                                        if obj not in existing_document[field]
-                                    ]
-                                    continue
-                            if value not in existing_document[field]:
-                                existing_document[field].append(value)
-                            continue
-                        # push to array in a nested attribute
-                        else:
-                            # create nested attributes if they do not exist
-                            subdocument = existing_document
-                            for field in nested_field_list[:-1]:
-                                if field not in subdocument:
-                                    subdocument[field] = {}
-
-                                subdocument = subdocument[field]
-
-                            # we're pushing a list
-                            push_results = []
-                            if nested_field_list[-1] in subdocument:
-                                # if the list exists, then use that list
-                                push_results = subdocument[nested_field_list[-1]]
-
-                            if isinstance(value, dict) and "$each" in value:
-                                push_results += [
-                                    obj
-                                    for obj in list(value["$each"])
-                                    if obj not in push_results
-                                ]
-                            elif value not in push_results:
-                                push_results.append(value)
-
-                            subdocument[nested_field_list[-1]] = push_results
-                elif k == "$pull":
-                    for field, value in iteritems(v):
-                        nested_field_list = field.rsplit(".")
-                        # nested fields includes a positional element
-                        # need to find that element
-                        if "$" in nested_field_list:
-                            if not subdocument:
-                                subdocument = self._get_subdocument(
-                                    existing_document, spec, nested_field_list
+            elif k == "$addToSet":
+                for field, value in iteritems(v):
+                    nested_field_list = _split_dotted(field)
+                    if len(nested_field_list) == 1:
+                        if field not in existing_document:
+                            existing_document[field] = []
+                        # document should be a list append to it
+                        if isinstance(value, dict):
+                            if "$each" in value:
+                                # append the list to the field
+                                _add_to_set(
+                                    existing_document[field],
+                                    value["$each"],
                                 )
+                                continue
+                        if value not in existing_document[field]:
+                            existing_document[field].append(value)
+                        continue
+                    # push to array in a nested attribute
+                    else:
+                        # create nested attributes if they do not exist
+                        subdocument = existing_document
+                        for field in nested_field_list[:-1]:
+                            if field not in subdocument:
+                                subdocument[field] = {}
+
+                            subdocument = subdocument[field]
+
+                        # we're adding to the existing list in place,
+                        # creating it if missing
+                        push_results = subdocument.setdefault(
+                            nested_field_list[-1], []
+                        )
 
-                            # value should be a dictionary since we're pulling
-                            pull_results = []
-                            # and the last subdoc should be an array
-                            for obj in subdocument[nested_field_list[-1]]:
-                                if isinstance(obj, dict):
-                                    for pull_key, pull_value in iteritems(value):
-                                        if obj[pull_key] != pull_value:
-                                            pull_results.append(obj)
-                                    continue
-                                if obj != value:
-                                    pull_results.append(obj)
+                        if isinstance(value, dict) and "$each" in value:
+                            _add_to_set(push_results, value["$each"])
+                        elif value not in push_results:
+                            push_results.append(value)
+            elif k == "$pull":
+                for field, value in iteritems(v):
+                    nested_field_list = _split_dotted(field)
+                    # nested fields includes a positional element
+                    # need to find that element
+                    if "$" in nested_field_list:
+                        if not subdocument:
+                            subdocument = self._get_subdocument_cached(
+                                existing_document,
+                                spec,
+                                nested_field_list,
+                                positional_resolutions,
+                            )
 
-                            # cannot write to doc directly as it doesn't save to
-                            # existing_document
-                            subdocument[nested_field_list[-1]] = pull_results
-                        else:
-                            arr = existing_document
-                            for field in nested_field_list:
-                                if field not in arr:
-                                    break
-                                arr = arr[field]
-                            if not isinstance(arr, list):
-                                continue
+                        # value should be a dictionary since we're pulling
+                        pv_items = (
+                            tuple(iteritems(value))
+                            if isinstance(value, dict)
+                            else None
+                        )
+                        pull_results = []
+                        # and the last subdoc should be an array
+                        for obj in subdocument[nested_field_list[-1]]:
+                            if pv_items is not None and isinstance(obj, dict):
+                                if any(
+                                    obj.get(pull_key) != pull_value
+                                    for pull_key, pull_value in pv_items
+                                ):
+                                    pull_results.append(obj)
+                            elif obj != value:
+                                pull_results.append(obj)
 
-                            arr_copy = copy.deepcopy(arr)
-                            if isinstance(value, dict):
-                                for obj in arr_copy:
-                                    if filter_applies(value, obj):
-                                        arr.remove(obj)
-                            else:
-                                for obj in arr_copy:
-                                    if value == obj:
-                                        arr.remove(obj)
-                elif k == "$pullAll":
-                    for field, value in iteritems(v):
-                        nested_field_list = field.rsplit(".")
-                        if len(nested_field_list) == 1:
-                            if field in existing_document:
-                                arr = existing_document[field]
-                                existing_document[field] = [
-                                    obj for obj in arr if obj not in value
-                                ]
+                        # cannot write to doc directly as it doesn't save to
+                        # existing_document
+                        subdocument[nested_field_list[-1]] = pull_results
+                    else:
+                        arr = existing_document
+                        for field in nested_field_list:
+                            if field not in arr:
+                                break
+                            arr = arr[field]
+                        if not isinstance(arr, list):
                             continue
+
+                        if isinstance(value, dict):
+                            arr[:] = [
+                                obj for obj in arr
+                                if not filter_applies(value, obj)
+                            ]
                         else:
-                            subdocument = existing_document
-                            for nested_field in nested_field_list[:-1]:
-                                if nested_field not in subdocument:
-                                    break
-                                subdocument = subdocument[nested_field]
-
-                            if nested_field_list[-1] in subdocument:
-                                arr = subdocument[nested_field_list[-1]]
-                                subdocument[nested_field_list[-1]] = [
-                                    obj for obj in arr if obj not in value
-                                ]
-                elif k == "$push":
-                    for field, value in iteritems(v):
-                        nested_field_list = field.rsplit(".")
-                        if len(nested_field_list) == 1:
-                            if field not in existing_document:
-                                existing_document[field] = []
-                            # document should be a list
-                            # append to it
-                            if isinstance(value, dict):
-                                if "$slice" in value:
-                                    raise NotImplementedError(
-                                        "$slice is a valid modifier of a $push operation but it is "
-                                        "not supported by Mongomock yet"
-                                    )
-                                if "$each" in value:
-                                    # append the list to the field
-                                    existing_document[field] += list(value["$each"])
-                                    continue
-                            existing_document[field].append(value)
-                            continue
-                        # nested fields includes a positional element
-                        # need to find that element
-                        elif "$" in nested_field_list:
-                            if not subdocument:
-                                subdocument = self._get_subdocument(
-                                    existing_document, spec, nested_field_list
+                            arr[:] = [obj for obj in arr if obj != value]
+            elif k == "$pullAll":
+                for field, value in iteritems(v):
+                    nested_field_list = _split_dotted(field)
+                    if len(nested_field_list) == 1:
+                        if field in existing_document:
+                            arr = existing_document[field]
+                            existing_document[field] = _pull_all(arr, value)
+                        continue
+                    else:
+                        subdocument = existing_document
+                        for nested_field in nested_field_list[:-1]:
+                            if nested_field not in subdocument:
+                                break
+                            subdocument = subdocument[nested_field]
+
+                        if nested_field_list[-1] in subdocument:
+                            arr = subdocument[nested_field_list[-1]]
+                            subdocument[nested_field_list[-1]] = _pull_all(
+                                arr, value
+                            )
+            elif k == "$push":
+                for field, value in iteritems(v):
+                    nested_field_list = _split_dotted(field)
+                    if len(nested_field_list) == 1:
+                        if field not in existing_document:
+                            existing_document[field] = []
+                        # document should be a list
+                        # append to it
+                        if isinstance(value, dict):
+                            if "$slice" in value:
+                                raise NotImplementedError(
+                                    "$slice is a valid modifier of a $push operation but it is "
+                                    "not supported by Mongomock yet"
                                 )
+                            if "$each" in value:
+                                # append the list to the field
+                                existing_document[field] += value["$each"]
+                                continue
+                        existing_document[field].append(value)
+                        continue
+                    # nested fields includes a positional element
+                    # need to find that element
+                    elif "$" in nested_field_list:
+                        if not subdocument:
+                            subdocument = self._get_subdocument_cached(
+                                existing_document,
+                                spec,
+                                nested_field_list,
+                                positional_resolutions,
+                            )
+
+                        # we're extending the existing list in place,
+                        # creating it if missing; subdocument belongs to
+                        # existing_document so the change sticks
+                        push_results = subdocument.setdefault(
+                            nested_field_list[-1], []
+                        )
 
-                            # we're pushing a list
-                            push_results = []
-                            if nested_field_list[-1] in subdocument:
-                                # if the list exists, then use that list
-                                push_results = subdocument[nested_field_list[-1]]
-
-                            if isinstance(value, dict):
-                                if "$slice" in value:
-                                    raise NotImplementedError(
-                                        "$slice is a valid modifier of a $push operation but it is "
-                                        "not supported by Mongomock yet"
-                                    )
-                                # check to see if we have the format
-                                # { '$each': [] }
-                                if "$each" in value:
-                                    push_results += list(value["$each"])
-                                else:
-                                    push_results.append(value)
+                        if isinstance(value, dict):
+                            if "$slice" in value:
+                                raise NotImplementedError(
+                                    "$slice is a valid modifier of a $push operation but it is "
+                                    "not supported by Mongomock yet"
+                                )
+                            # check to see if we have the format
+                            # { '$each': [] }
+                            if "$each" in value:
+                                push_results.extend(value["$each"])
                             else:
                                 push_results.append(value)
-
-                            # cannot write to doc directly as it doesn't save to
-                            # existing_document
-                            subdocument[nested_field_list[-1]] = push_results
-                        # push to array in a nested attribute
                         else:
-                            # create nested attributes if they do not exist
-                            subdocument = existing_document
-                            for field in nested_field_list[:-1]:
-                                if isinstance(subdocument, dict):
-                                    if field not in subdocument:
-                                        subdocument[field] = {}
-                                    subdocument = subdocument[field]
-                                else:
-                                    subdocument = subdocument[int(field)]
-
-                            # we're pushing a list
-                            push_results = []
-                            if nested_field_list[-1] in subdocument:
-                                # if the list exists, then use that list
-                                push_results = subdocument[nested_field_list[-1]]
-
-                            if isinstance(value, dict) and "$each" in value:
-                                if "$slice" in value:
-                                    raise NotImplementedError(
-                                        "$slice is a valid modifier of a $push operation but it is "
-                                        "not supported by Mongomock yet"
-                                    )
-                                push_results += list(value["$each"])
+                            push_results.append(value)
+                    # push to array in a nested attribute
+                    else:
+                        # create nested attributes if they do not exist
+                        subdocument = existing_document
+                        for field in nested_field_list[:-1]:
+                            if isinstance(subdocument, dict):
+                                if field not in subdocument:
+                                    subdocument[field] = {}
+                                subdocument = subdocument[field]
                             else:
-                                push_results.append(value)
+                                subdocument = subdocument[int(field)]
 
-                            subdocument[nested_field_list[-1]] = push_results
-                else:
-                    if first:
-                        # replace entire document
-                        for key in document.keys():
-                            if key.startswith("$"):
-                                # can't mix modifiers with non-modifiers in
-                                # update
-                                raise ValueError(
-                                    "field names cannot start with $ [{}]".format(k)
-                                )
-                        _id = spec.get("_id", existing_document.get("_id"))
-                        existing_document.clear()
-                        if _id:
-                            existing_document["_id"] = _id
-                        if BSON:
-                            # bson validation
-                            BSON.encode(document, check_keys=True)
-                        existing_document.update(self._internalize_dict(document))
-                        if existing_document["_id"] != _id:
-                            raise OperationFailure(
-                                "The _id field cannot be changed from {0} to {1}".format(
-                                    existing_document["_id"], _id
+                        # we're extending the existing list in place,
+                        # creating it if missing
+                        push_results = subdocument.setdefault(
+                            nested_field_list[-1], []
+                        )
+
+                        if isinstance(value, dict) and "$each" in value:
+                            if "$slice" in value:
+                                raise NotImplementedError(
+                                    "$slice is a valid modifier of a $push operation but it is "
+                                    "not supported by Mongomock yet"
                                 )
-                            )
-                        break
-                    else:
-                        # can't mix modifiers with non-modifiers in update
-                        raise ValueError("Invalid modifier specified: {}".format(k))
-                first = False
-            # if empty document comes
-            if not document:
-                _id = spec.get("_id", existing_document.get("_id"))
-                existing_document.clear()
-                if _id:
-                    existing_document["_id"] = _id
-
-            if was_insert:
-                upserted_id = self._insert(existing_document)
+                            push_results.extend(value["$each"])
+                        else:
+                            push_results.append(value)
             else:
-                # Document has been modified in-place, last thing is to make sure it
-                # still respect the unique indexes and if not to revert modifications
-                try:
-                    self._ensure_uniques(existing_document)
-                except DuplicateKeyError:
-                    # Rollback
-                    self._documents[
-                        original_document_snapshot["_id"]
-                    ] = original_document_snapshot
-                    raise
-
-            if not multi:
-                break
+                if first:
+                    # replace entire document
+                    for key in document.keys():
+                        if key.startswith("$"):
+                            # can't mix modifiers with non-modifiers in
+                            # update
+                            raise ValueError(
+                                "field names cannot start with $ [{}]".format(k)
+                            )
+                    _id = spec.get("_id", existing_document.get("_id"))
+                    existing_document.clear()
+                    if _id:
+                        existing_document["_id"] = _id
+                    if BSON:
+                        # bson validation, without serializing the whole
+                        # document to a throw-away buffer
+                        _validate_keys(document)
+                    existing_document.update(self._internalize_dict(document))
+                    if existing_document["_id"] != _id:
+                        raise OperationFailure(
+                            "The _id field cannot be changed from {0} to {1}".format(
+                                existing_document["_id"], _id
+                            )
+                        )
+                    break
+                else:
+                    # can't mix modifiers with non-modifiers in update
+                    raise ValueError("Invalid modifier specified: {}".format(k))
+            first = False
+        # if empty document comes
+        if not document:
+            _id = spec.get("_id", existing_document.get("_id"))
+            existing_document.clear()
+            if _id:
+                existing_document["_id"] = _id
+
+    def _get_subdocument_cached(
+        self, existing_document, spec, nested_field_list, resolutions
+    ):
+        """Resolve a positional subdocument, reusing prior resolutions.
 
-        return {
-            text_type("connectionId"): self.database.client._id,
-            text_type("err"): None,
-            text_type("n"): num_updated,
-            text_type("nModified"): num_updated if updated_existing else 0,
-            text_type("ok"): 1,
-            text_type("upserted"): upserted_id,
-            text_type("updatedExisting"): updated_existing,
-        }
+        resolutions maps dotted-path tuples to already-resolved
+        subdocuments, so several operators touching the same array in one
+        update scan it only once.
+        """
+        if nested_field_list not in resolutions:
+            resolutions[nested_field_list] = self._get_subdocument(
+                existing_document, spec, nested_field_list
+            )
+        return resolutions[nested_field_list]
 
     def _get_subdocument(self, existing_document, spec, nested_field_list):
         """This method retrieves the subdocument of the existing_document.nested_field_list.
@@ -952,9 +1411,10 @@ class Collection(object):
                 # positional element should have the equivalent elemMatch in the
                 # query
                 subspec = subspec["$elemMatch"]
+                element_matches = compile_filter(subspec)
                 for item in doc:
                     # iterate through
-                    if filter_applies(subspec, item):
+                    if element_matches(item):
                         # found the matching item save the parent
                         subdocument = doc
                         # save the item
@@ -973,12 +1433,11 @@ class Collection(object):
     def _expand_dots(self, doc):
         expanded = {}
         paths = {}
-        for k, v in iteritems(doc):
-            key_parts = k.split(".")
-            sub_doc = v
-            for i in reversed(range(1, len(key_parts))):
-                key = key_parts[i]
-                sub_doc = {key: sub_doc}
+        for k, v in doc.items():
+            key_parts = _split_dotted(k)
+            sub_doc = functools.reduce(
+                lambda acc, part: {part: acc}, reversed(key_parts[1:]), v
+            )
             key = key_parts[0]
             if key in expanded:
                 raise WriteError(
@@ -991,7 +1450,7 @@ class Collection(object):
 
     def _discard_operators(self, doc):
         # TODO(this looks a little too naive...)
-        return {k: v for k, v in iteritems(doc) if not k.startswith("$")}
+        return {k: v for k, v in doc.items() if not k.startswith("$")}
 
     def find(
         self,
@@ -1016,26 +1475,72 @@ class Collection(object):
         validate_is_mapping("filter", spec)
         return Cursor(self, spec, sort, projection, skip, limit, collation=collation)
 
-    def _get_dataset(self, spec, sort, fields, as_class):
-        dataset = self._iter_documents(spec)
+    def _get_dataset(
+        self,
+        spec,
+        sort,
+        fields,
+        as_class,
+        skip=0,
+        limit=0,
+        matcher=None,
+        projection=None,
+    ):
+        dataset = self._iter_documents(spec, matcher)
         if sort:
+            # A positive limit lets the sort keep only the top skip+limit
+            # documents instead of ordering the full match set.
+            dataset = self._sort_dataset(
+                dataset, sort, skip + limit if limit else None
+            )
+        if skip or limit:
+            # Slice before projecting so discarded rows are never copied.
+            dataset = itertools.islice(
+                dataset, skip, skip + limit if limit else None
+            )
+        if projection is None:
+            # Parse the projection once for the whole result set instead
+            # of once per yielded document.
+            projection = self._compile_projection(fields)
+        for document in dataset:
+            yield self._project_document(document, projection, as_class)
+
+    def _sort_dataset(self, dataset, sort, limit=None):
+        if any(sort_key == "$natural" for sort_key, unused_direction in sort):
+            # $natural refers to insertion order, which a composite key
+            # cannot express; keep one stable pass per key for it.
             for sort_key, sort_direction in reversed(sort):
-                if sort_key == '$natural':
+                if sort_key == "$natural":
                     if sort_direction < 0:
                         dataset = iter(reversed(list(dataset)))
                     continue
-                dataset = iter(sorted(
-                    dataset, key=lambda x: resolve_sort_key(sort_key, x),
-                    reverse=sort_direction < 0))
-        for document in dataset:
-            yield self._copy_only_fields(document, fields, as_class)
+                decorated = [
+                    (resolve_sort_key(sort_key, document), document)
+                    for document in dataset
+                ]
+                decorated.sort(
+                    key=operator.itemgetter(0), reverse=sort_direction < 0
+                )
+                dataset = iter(
+                    document for unused_sort_key, document in decorated
+                )
+            return dataset
+
+        sort_keys = [sort_key for sort_key, unused_direction in sort]
+        directions = [sort_direction for unused_key, sort_direction in sort]
+        return iter(
+            _sort_by_composite_key(
+                dataset, sort_keys, directions, resolve_sort_key, limit
+            )
+        )
 
     def _copy_field(self, obj, container):
+        # Immutable leaves make up most of a document and need no copy at
+        # all; this skips a copy.copy call per leaf.
+        if isinstance(obj, _IMMUTABLE_LEAF_TYPES):
+            return obj
         if isinstance(obj, list):
-            new = []
-            for item in obj:
-                new.append(self._copy_field(item, container))
-            return new
+            return [self._copy_field(item, container) for item in obj]
         if isinstance(obj, dict):
             new = container()
             for key, value in obj.items():
@@ -1047,7 +1552,7 @@ class Collection(object):
         """Removes and returns fields with projection operators."""
         result = {}
         allowed_projection_operators = {"$elemMatch"}
-        for key, value in iteritems(fields):
+        for key, value in fields.items():
             if isinstance(value, dict):
                 for op in value:
                     if op not in allowed_projection_operators:
@@ -1061,7 +1566,7 @@ class Collection(object):
 
     def _apply_projection_operators(self, ops, doc, doc_copy):
         """Applies projection operators to copied document."""
-        for field, op in iteritems(ops):
+        for field, op in ops.items():
             if field not in doc_copy:
                 if field in doc:
                     # field was not copied yet (since we are in include mode)
@@ -1090,91 +1595,153 @@ class Collection(object):
 
     def _copy_only_fields(self, doc, fields, container):
         """Copy only the specified fields."""
+        return self._project_document(doc, self._compile_projection(fields), container)
+
+    def _compile_projection(self, fields):
+        """Normalize a projection once so it is not re-parsed per document.
 
+        Returns None for "copy the whole document", otherwise a
+        _CompiledProjection consumed by _project_document.
+        """
         if fields is None:
-            return self._copy_field(doc, container)
+            return None
 
         if not fields:
             fields = {"_id": 1}
         if not isinstance(fields, dict):
             fields = helpers._fields_list_to_dict(fields)
+        # Work on a copy so the caller's projection dict is left untouched.
+        fields = dict(fields)
 
         # we can pass in something like {'_id':0, 'field':1}, so pull the id
         # value out and hang on to it until later
         id_value = fields.pop("_id", 1)
 
-        # filter out fields with projection operators, we will take care of them later
+        # filter out fields with projection operators, they are applied
+        # separately after the copy
         projection_operators = self._extract_projection_operators(fields)
 
         # other than the _id field, all fields must be either includes or
         # excludes, this can evaluate to 0
-        if len(set(list(fields.values()))) > 1:
+        if len(set(fields.values())) > 1:
             raise ValueError("You cannot currently mix including and excluding fields.")
 
-        # if we have novalues passed in, make a doc_copy based on the
+        is_include = bool(fields and list(fields.values())[0])
+        flat_keys = None
+        combined_spec = None
+        if fields:
+            # '$' stays on the spec-walking path so positional projection
+            # keeps raising its per-document error.
+            if all("." not in key and key != "$" for key in fields):
+                flat_keys = list(fields)
+            else:
+                combined_spec = _combine_projection_spec(fields)
+        return _CompiledProjection(
+            id_value,
+            is_include,
+            bool(fields),
+            flat_keys,
+            combined_spec,
+            projection_operators,
+        )
+
+    def _project_document(self, doc, projection, container):
+        """Copy a document according to an already-compiled projection."""
+        if projection is None:
+            if not self._copy_on_read and container is dict:
+                return doc
+            return self._copy_field(doc, container)
+
+        # if we have no values passed in, make a doc_copy based on the
         # id_value
-        if not fields:
-            if id_value == 1:
+        if not projection.has_fields:
+            if projection.id_value == 1:
+                # The frequent {'_id': 1} shape needs no container dance
+                # when a plain dict was asked for.
+                if container is dict and not projection.projection_operators:
+                    return {"_id": doc["_id"]} if "_id" in doc else {}
                 doc_copy = container()
             else:
                 doc_copy = self._copy_field(doc, container)
+        elif projection.flat_keys is not None:
+            # Flat field list: act on the fields straight off the document
+            # instead of walking the combined projection spec. Leaf values
+            # are shared, exactly as _project_by_spec does.
+            doc_copy = container()
+            if projection.is_include:
+                for key in projection.flat_keys:
+                    if key in doc:
+                        doc_copy[key] = doc[key]
+            else:
+                doc_copy.update(doc)
+                for key in projection.flat_keys:
+                    doc_copy.pop(key, None)
         else:
             doc_copy = _project_by_spec(
                 doc,
-                _combine_projection_spec(fields),
-                is_include=list(fields.values())[0],
+                projection.combined_spec,
+                is_include=projection.is_include,
                 container=container,
             )
 
         # set the _id value if we requested it, otherwise remove it
-        if id_value == 0:
+        if projection.id_value == 0:
             doc_copy.pop("_id", None)
         else:
             if "_id" in doc:
                 doc_copy["_id"] = doc["_id"]
 
-        fields["_id"] = id_value  # put _id back in fields
-
-        # time to apply the projection operators and put back their fields
-        self._apply_projection_operators(projection_operators, doc, doc_copy)
-        for field, op in iteritems(projection_operators):
-            fields[field] = op
+        # time to apply the projection operators
+        self._apply_projection_operators(
+            projection.projection_operators, doc, doc_copy
+        )
         return doc_copy
 
     def _update_document_fields(self, doc, fields, updater):
         """Implements the $set behavior on an existing document"""
-        for k, v in iteritems(fields):
+        for k, v in fields.items():
             self._update_document_single_field(doc, k, v, updater)
 
     def _update_document_fields_positional(
         self, doc, fields, spec, updater, subdocument=None
     ):
         """Implements the $set behavior on an existing document"""
+        # The positional walk only depends on the parent path, so sibling
+        # fields sharing a path reuse one resolution instead of re-scanning
+        # the array per field.
+        resolved_paths = {}
         for k, v in iteritems(fields):
             if "$" in k:
 
-                field_name_parts = k.split(".")
+                field_name_parts = _split_dotted(k)
                 if not subdocument:
-                    current_doc = doc
-                    subspec = spec
-                    for part in field_name_parts[:-1]:
-                        if part == "$":
-                            subspec = subspec.get("$elemMatch", subspec)
-                            for item in current_doc:
-                                if filter_applies(subspec, item):
-                                    current_doc = item
-                                    break
-                            continue
+                    parent_path = field_name_parts[:-1]
+                    if parent_path in resolved_paths:
+                        current_doc, subspec = resolved_paths[parent_path]
+                    else:
+                        current_doc = doc
+                        subspec = spec
+                        for part in parent_path:
+                            if part == "$":
+                                subspec = subspec.get("$elemMatch", subspec)
+                                element_matches = compile_filter(subspec)
+                                for item in current_doc:
+                                    if element_matches(item):
+                                        current_doc = item
+                                        break
+                                continue
 
-                        new_spec = {}
-                        for el in subspec:
-                            if el.startswith(part):
-                                if len(el.split(".")) > 1:
-                                    new_spec[".".join(el.split(".")[1:])] = subspec[el]
-                                else:
-                                    new_spec = subspec[el]
-                        subspec = new_spec
-                        current_doc = current_doc[part]
+                            new_spec = {}
+                            for el in subspec:
+                                if el.startswith(part):
+                                    unused_head, sep, rest = el.partition(".")
+                                    if sep:
+                                        new_spec[rest] = subspec[el]
+                                    else:
+                                        new_spec = subspec[el]
+                            subspec = new_spec
+                            current_doc = current_doc[part]
+                        resolved_paths[parent_path] = (current_doc, subspec)
 
                     subdocument = current_doc
                     if field_name_parts[-1] == "$" and isinstance(subdocument, list):
@@ -1191,20 +1758,8 @@ class Collection(object):
 
         return subdocument
 
-    def _update_document_fields_with_positional_awareness(
-        self, existing_document, v, spec, updater, subdocument
-    ):
-        positional = any("$" in key for key in iterkeys(v))
-
-        if positional:
-            return self._update_document_fields_positional(
-                existing_document, v, spec, updater, subdocument
-            )
-        self._update_document_fields(existing_document, v, updater)
-        return subdocument
-
     def _update_document_single_field(self, doc, field_name, field_value, updater):
-        field_name_parts = field_name.split(".")
+        field_name_parts = _split_dotted(field_name)
         for part in field_name_parts[:-1]:
             if isinstance(doc, list):
                 try:
@@ -1216,10 +1771,17 @@ class Collection(object):
                 except ValueError:
                     pass
             elif isinstance(doc, dict):
-                if updater is _unset_updater and part not in doc:
-                    # If the parent doesn't exists, so does it child.
-                    return
-                doc = doc.setdefault(part, {})
+                # One hash lookup per level: fetch, and only create the
+                # intermediate dict on a miss.
+                try:
+                    doc = doc[part]
+                except KeyError:
+                    if updater is _unset_updater:
+                        # If the parent doesn't exists, so does it child.
+                        return
+                    new_doc = {}
+                    doc[part] = new_doc
+                    doc = new_doc
             else:
                 return
         field_name = field_name_parts[-1]
@@ -1231,13 +1793,44 @@ class Collection(object):
         else:
             updater(doc, field_name, field_value)
 
-    def _iter_documents(self, filter=None):
+    def _iter_documents(self, filter=None, matcher=None):
         return (
             document
-            for document in list(itervalues(self._documents))
-            if filter_applies(filter, document)
+            for unused_doc_id, document in self._iter_document_items(filter, matcher)
         )
 
+    def _iter_document_items(self, filter=None, matcher=None):
+        """Iterate (store key, document) pairs of the documents matching filter.
+
+        A caller that runs the same filter repeatedly can pass the
+        predicate from compile_filter() as 'matcher' to skip recompiling.
+        """
+        # A single-key equality query on _id is a direct lookup in the
+        # _id-keyed document store; no need to scan the whole collection.
+        if (
+            isinstance(filter, dict)
+            and len(filter) == 1
+            and "_id" in filter
+            and not isinstance(filter["_id"], (dict, helpers.RE_TYPE))
+        ):
+            try:
+                document = self._documents.get(filter["_id"])
+            except TypeError:
+                # Unhashable _id value: fall back to the full scan.
+                pass
+            else:
+                if document is not None and filter_applies(filter, document):
+                    yield filter["_id"], document
+                return
+        # Snapshot only the keys so concurrent mutation stays safe without
+        # duplicating the whole list of documents in memory. The filter is
+        # compiled once instead of being re-parsed for every document.
+        predicate = matcher if matcher is not None else compile_filter(filter)
+        for doc_id in list(self._documents):
+            document = self._documents.get(doc_id)
+            if document is not None and predicate(document):
+                yield doc_id, document
+
     def find_one(self, filter=None, *args, **kwargs):
         # Allow calling find_one with a non-dict argument that gets used as
         # the id for the query.
@@ -1390,16 +1983,23 @@ class Collection(object):
             filter = {}
         if not isinstance(filter, Mapping):
             filter = {"_id": filter}
-        to_delete = list(self.find(filter))
+        # Collect only the store keys of the matches; copying the documents
+        # through find() would be wasted work since they are dropped anyway.
+        to_delete_ids = []
+        for doc_id, unused_document in self._iter_document_items(filter):
+            to_delete_ids.append(doc_id)
+            if not multi:
+                break
         deleted_count = 0
-        for doc in to_delete:
-            doc_id = doc["_id"]
-            if isinstance(doc_id, dict):
-                doc_id = helpers.hashdict(doc_id)
+        if to_delete_ids:
+            self._invalidate_query_cache()
+        for doc_id in to_delete_ids:
             del self._documents[doc_id]
+            for unused_unique, unused_sparse, value_map, id_map in self._uniques.values():
+                index_key = id_map.pop(doc_id, NOTHING)
+                if index_key is not NOTHING and value_map.get(index_key) == doc_id:
+                    del value_map[index_key]
             deleted_count += 1
-            if not multi:
-                break
 
         return {
             "connectionId": self.database.client._id,
@@ -1430,7 +2030,7 @@ class Collection(object):
             raise NotImplementedError("Mongomock does not handle sessions yet")
         if filter is None:
             return len(self._documents)
-        return len(list(self._iter_documents(filter)))
+        return sum(1 for _ in self._iter_documents(filter))
 
     def count_documents(self, filter, **kwargs):
         if kwargs.pop("collation", None):
@@ -1454,10 +2054,22 @@ class Collection(object):
         if unknown_kwargs:
             raise OperationFailure("unrecognized field '%s'" % unknown_kwargs.pop())
 
-        count = len(list(self._iter_documents(filter)))
+        if not filter:
+            count = len(self._documents)
+        elif limit is None:
+            count = sum(1 for _ in self._iter_documents(filter))
+        else:
+            # No need to scan past skip + limit matches: the result is
+            # capped at limit anyway.
+            needed = skip + limit
+            count = 0
+            for _ in self._iter_documents(filter):
+                count += 1
+                if count >= needed:
+                    break
         if limit is None:
             return count - skip
-        return min(count - skip, limit)
+        return max(0, min(count - skip, limit))
 
     def estimated_document_count(self, **kwargs):
         if kwargs.pop("session", None):
@@ -1498,22 +2110,27 @@ class Collection(object):
         # Check that documents already verify the uniquess of this new index.
         if is_unique:
             self._index_information[index_string]["unique"] = True
-            indexed = set()
-            for doc in itervalues(self._documents):
+            # Compile each indexed key's accessor once; the value map itself
+            # doubles as the duplicate check.
+            getters = [_compile_path(key).get for key, unused_order in index_list]
+            value_map = {}
+            id_map = {}
+            for doc_id, doc in iteritems(self._documents):
                 index = []
-                for key, unused_order in index_list:
+                for getter in getters:
                     try:
-                        index.append(get_value_by_dot(doc, key))
+                        index.append(_make_hashable(getter(doc)))
                     except KeyError:
                         if is_sparse:
                             continue
                         index.append(None)
                 index = tuple(index)
-                if index in indexed:
+                if index in value_map:
                     raise DuplicateKeyError("E11000 Duplicate Key Error", 11000)
-                indexed.add(index)
+                value_map[index] = doc_id
+                id_map[doc_id] = index
 
-            self._uniques[index_string] = (index_list, is_sparse)
+            self._uniques[index_string] = (index_list, is_sparse, value_map, id_map)
 
         return index_string
 
@@ -1544,7 +2161,13 @@ class Collection(object):
     def index_information(self, session=None):
         if session:
             raise NotImplementedError("Mongomock does not handle sessions yet")
-        return copy.deepcopy(self._index_information)
+        # Index info entries are shallow: the only mutable value is the
+        # "key" list of (field, direction) tuples, so a per-entry rebuild
+        # is much cheaper than copy.deepcopy.
+        return {
+            name: dict(info, key=list(info["key"]))
+            for name, info in iteritems(self._index_information)
+        }
 
     def map_reduce(
         self,
@@ -1574,51 +2197,12 @@ class Collection(object):
             "ok": 1.0,
             "result": None,
         }
-        map_ctx = execjs.compile(
-            """
-            function doMap(fnc, docList) {
-                var mappedDict = {};
-                function emit(key, val) {
-                    if (key['$oid']) {
-                        mapped_key = '$oid' + key['$oid'];
-                    }
-                    else {
-                        mapped_key = key;
-                    }
-                    if(!mappedDict[mapped_key]) {
-                        mappedDict[mapped_key] = [];
-                    }
-                    mappedDict[mapped_key].push(val);
-                }
-                mapper = eval('('+fnc+')');
-                var mappedList = new Array();
-                for(var i=0; i<docList.length; i++) {
-                    var thisDoc = eval('('+docList[i]+')');
-                    var mappedVal = (mapper).call(thisDoc);
-                }
-                return mappedDict;
-            }
-        """
-        )
-        reduce_ctx = execjs.compile(
-            """
-            function doReduce(fnc, docList) {
-                var reducedList = new Array();
-                reducer = eval('('+fnc+')');
-                for(var key in docList) {
-                    var reducedVal = {'_id': key,
-                            'value': reducer(key, docList[key])};
-                    reducedList.push(reducedVal);
-                }
-                return reducedList;
-            }
-        """
-        )
-        doc_list = [
-            json.dumps(doc, default=json_util.default) for doc in self.find(query)
-        ]
-        mapped_rows = map_ctx.call("doMap", map_func, doc_list)
-        reduced_rows = reduce_ctx.call("doReduce", reduce_func, mapped_rows)[:limit]
+        map_ctx = _compile_js(_DO_MAP_JS, map_func)
+        reduce_ctx = _compile_js(_DO_REDUCE_JS, reduce_func)
+        doc_list = list(self.find(query))
+        docs_json = json.dumps(doc_list, default=json_util.default)
+        mapped_rows = map_ctx.call("doMap", docs_json)
+        reduced_rows = reduce_ctx.call("doReduce", mapped_rows)[:limit]
         for reduced_row in reduced_rows:
             if reduced_row["_id"].startswith("$oid"):
                 reduced_row["_id"] = ObjectId(reduced_row["_id"][4:])
@@ -1684,61 +2268,45 @@ class Collection(object):
                 "PyExecJS is required in order to use group. "
                 "Use 'pip install pyexecjs pymongo' to support group mock."
             )
-        reduce_ctx = execjs.compile(
-            """
-            function doReduce(fnc, docList) {
-                reducer = eval('('+fnc+')');
-                for(var i=0, l=docList.length; i<l; i++) {
-                    try {
-                        reducedVal = reducer(docList[i-1], docList[i]);
-                    }
-                    catch (err) {
-                        continue;
-                    }
-                }
-            return docList[docList.length - 1];
-            }
-        """
-        )
+        reduce_ctx = _compile_js(_GROUP_DO_REDUCE_JS, reduce)
 
         ret_array = []
         doc_list_copy = []
-        ret_array_copy = []
-        reduced_val = {}
-        doc_list = [doc for doc in self.find(condition)]
-        for doc in doc_list:
-            doc_copy = copy.deepcopy(doc)
-            for k in doc:
-                if isinstance(doc[k], ObjectId):
-                    doc_copy[k] = str(doc[k])
+        for doc in list(self.find(condition)):
+            # Build the trimmed copy in one pass: keep only keys named in
+            # 'key' or appearing in the reduce source, stringifying
+            # ObjectIds for the JS runtime along the way.
+            doc_copy = {}
+            for k, v in iteritems(doc):
                 if k not in key and k not in reduce:
-                    del doc_copy[k]
-            for initial_key in initial:
-                if initial_key in doc.keys():
-                    pass
-                else:
-                    doc_copy[initial_key] = initial[initial_key]
+                    continue
+                doc_copy[k] = str(v) if isinstance(v, ObjectId) else _fast_clone(v)
+            for initial_key, initial_value in iteritems(initial):
+                if initial_key not in doc:
+                    doc_copy[initial_key] = initial_value
             doc_list_copy.append(doc_copy)
         doc_list = doc_list_copy
-        for k in key:
-            doc_list = sorted(doc_list, key=lambda x: _resolve_key(k, x))
         for k in key:
             if not isinstance(k, string_types):
                 raise TypeError(
                     "Keys must be a list of key names, "
                     "each an instance of %s" % string_types[0].__name__
                 )
-            for k2, group in itertools.groupby(doc_list, lambda item: item[k]):
-                group_list = [x for x in group]
-                reduced_val = reduce_ctx.call("doReduce", reduce, group_list)
-                ret_array.append(reduced_val)
-        for doc in ret_array:
-            doc_copy = copy.deepcopy(doc)
-            for k in doc:
-                if k not in key and k not in initial.keys():
-                    del doc_copy[k]
-            ret_array_copy.append(doc_copy)
-        ret_array = ret_array_copy
+        # Hash aggregation: one pass over the documents on a composite key
+        # instead of sorting once per key and grouping runs of equal values.
+        for unused_group_key, group_list in _groupby_hash(
+            doc_list,
+            lambda item: tuple(_make_hashable(_resolve_key(k, item)) for k in key),
+        ):
+            reduced_val = reduce_ctx.call("doReduce", group_list)
+            ret_array.append(reduced_val)
+        # The reduced documents are fresh dicts from the JS runtime, so a
+        # key filter is enough; no clone-then-delete pass needed.
+        keep_keys = set(key) | set(initial)
+        ret_array = [
+            {k: v for k, v in iteritems(doc) if k in keep_keys}
+            for doc in ret_array
+        ]
         return ret_array
 
     def aggregate(self, pipeline, session=None, **kwargs):
@@ -1784,27 +2352,33 @@ class Collection(object):
         ]
 
         def _extend_collection(out_collection, field, expression):
-            field_exists = False
-            for doc in out_collection:
-                if field in doc:
-                    field_exists = True
-                    break
-            if not field_exists:
+            # Documents that already carry the field keep their value; the
+            # others get the computed one. This replaces a full pass that
+            # probed whether the field existed anywhere in the collection.
+            if isinstance(expression, string_types) and expression.startswith("$"):
+                get_path = _compile_path(expression.lstrip("$")).get
                 for doc in out_collection:
-                    if isinstance(expression, string_types) and expression.startswith(
-                        "$"
-                    ):
-                        try:
-                            doc[field] = get_value_by_dot(doc, expression.lstrip("$"))
-                        except KeyError:
-                            pass
-                    else:
-                        # verify expression has operator as first
-                        doc[field] = aggregate.parse_expression(expression.copy(), doc)
+                    if field in doc:
+                        continue
+                    try:
+                        doc[field] = get_path(doc)
+                    except KeyError:
+                        pass
+            else:
+                # verify expression has operator as first
+                compiled_expression = aggregate.compile_expression(expression)
+                for doc in out_collection:
+                    if field not in doc:
+                        doc[field] = compiled_expression(doc)
             return out_collection
 
         def _accumulate_group(output_fields, group_list):
             doc_dict = {}
+            # Resolve the (field, operator, getter) dispatch once up front so
+            # the group is accumulated in a single pass over its documents
+            # instead of one pass (and one values list) per output field.
+            accumulators = []
+            states = []
             for field, value in iteritems(output_fields):
                 if field == "_id":
                     continue
@@ -1819,38 +2393,19 @@ class Collection(object):
                         "$addToSet",
                         "$push",
                     ):
-                        key_getter = functools.partial(aggregate.parse_expression, key)
-                        values = [key_getter(doc) for doc in group_list]
-
-                        if operator == "$sum":
-                            val_it = (val or 0 for val in values)
-                            doc_dict[field] = sum(val_it)
-                        elif operator == "$avg":
-                            values = [val or 0 for val in values]
-                            doc_dict[field] = sum(values) / max(len(values), 1)
-                        elif operator == "$min":
-                            val_it = (val or MAXSIZE for val in values)
-                            doc_dict[field] = min(val_it)
-                        elif operator == "$max":
-                            val_it = (val or -MAXSIZE for val in values)
-                            doc_dict[field] = max(val_it)
-                        elif operator == "$first":
-                            doc_dict[field] = values[0]
+                        key_getter = aggregate.compile_expression(key)
+                        if operator == "$first":
+                            doc_dict[field] = key_getter(group_list[0])
                         elif operator == "$last":
-                            doc_dict[field] = values[-1]
-                        elif operator == "$addToSet":
-                            value = []
-                            val_it = (val or None for val in values)
-                            # Don't use set in case elt in not hashable (like dicts).
-                            for elt in val_it:
-                                if elt not in value:
-                                    value.append(elt)
-                            doc_dict[field] = value
-                        elif operator == "$push":
-                            if field not in doc_dict:
-                                doc_dict[field] = values
+                            doc_dict[field] = key_getter(group_list[-1])
+                        else:
+                            accumulators.append((field, operator, key_getter))
+                            if operator in ("$sum", "$avg"):
+                                states.append(0)
+                            elif operator in ("$addToSet", "$push"):
+                                states.append([])
                             else:
-                                doc_dict[field].extend(values)
+                                states.append(None)
                     elif operator in group_operators:
                         raise NotImplementedError(
                             "Although %s is a valid group operator for the "
@@ -1864,15 +2419,196 @@ class Collection(object):
                             "aggregation-quick-reference/ for a complete list of "
                             "valid operators." % operator
                         )
+
+            for doc in group_list:
+                for index, (field, operator, key_getter) in enumerate(accumulators):
+                    val = key_getter(doc)
+                    if operator in ("$sum", "$avg"):
+                        states[index] += val or 0
+                    elif operator == "$min":
+                        val = val or MAXSIZE
+                        if states[index] is None or val < states[index]:
+                            states[index] = val
+                    elif operator == "$max":
+                        val = val or -MAXSIZE
+                        if states[index] is None or val > states[index]:
+                            states[index] = val
+                    elif operator == "$addToSet":
+                        # Don't use set in case elt in not hashable (like dicts).
+                        elt = val or None
+                        if elt not in states[index]:
+                            states[index].append(elt)
+                    else:  # $push
+                        states[index].append(val)
+
+            for (field, operator, unused_key_getter), state in zip(
+                accumulators, states
+            ):
+                if operator == "$avg":
+                    doc_dict[field] = state / max(len(group_list), 1)
+                elif operator in ("$min", "$max") and state is None:
+                    # Keep min()/max() behavior on an empty group.
+                    raise ValueError(
+                        "%s() arg is an empty sequence" % operator.lstrip("$")
+                    )
+                else:
+                    doc_dict[field] = state
             return doc_dict
 
-        out_collection = [doc for doc in self.find()]
-        for stage in pipeline:
+        def _lookup_documents(
+            docs, foreign_collection, local_field, foreign_field, local_name
+        ):
+            # Hash join: index the foreign collection once by foreignField
+            # instead of running one find() per input document. Array values
+            # are indexed per element, like a multikey index. Queries the
+            # index cannot answer faithfully (None matching missing fields,
+            # regular expressions, unhashable values, ObjectIds whose
+            # string form may sit in a foreign array) fall back to a
+            # linear scan with the regular filter machinery.
+            foreign_docs = list(foreign_collection.find())
+            foreign_index = {}
+            for position, foreign_doc in enumerate(foreign_docs):
+                for candidate in iter_key_candidates(foreign_field, foreign_doc):
+                    if candidate is NOTHING:
+                        continue
+                    elements = (
+                        candidate if isinstance(candidate, list) else [candidate]
+                    )
+                    for element in elements:
+                        try:
+                            foreign_index.setdefault(element, set()).add(position)
+                        except TypeError:
+                            # Unhashable foreign values can only match
+                            # unhashable queries, which use the fallback scan.
+                            pass
+
+            for doc in docs:
+                query = doc.get(local_field)
+                query_values = query if isinstance(query, list) else [query]
+                positions = set()
+                for value in query_values:
+                    if value is None or isinstance(
+                        value, (dict, helpers.RE_TYPE, ObjectId)
+                    ):
+                        positions = None
+                        break
+                    try:
+                        positions |= foreign_index.get(value, set())
+                    except TypeError:
+                        positions = None
+                        break
+                if positions is None:
+                    spec = {
+                        foreign_field: {"$in": query}
+                        if isinstance(query, list)
+                        else query
+                    }
+                    doc[local_name] = [
+                        _fast_clone(foreign_doc)
+                        for foreign_doc in foreign_docs
+                        if filter_applies(spec, foreign_doc)
+                    ]
+                else:
+                    doc[local_name] = [
+                        _fast_clone(foreign_docs[position])
+                        for position in sorted(positions)
+                    ]
+                yield doc
+
+        def _unwind_documents(
+            docs, path, should_preserve_null_and_empty, include_array_index
+        ):
+            # Resolve the path accessors once; the per-document work below
+            # is then plain closure calls with no path re-parsing.
+            path_parts = _split_dotted(path)
+            path_accessor = _compile_path(path)
+            if include_array_index:
+                set_index = _compile_path(include_array_index).set
+            for doc in docs:
+                try:
+                    array_value = path_accessor.get(doc)
+                except KeyError:
+                    if should_preserve_null_and_empty:
+                        yield doc
+                    continue
+                if array_value is None:
+                    if should_preserve_null_and_empty:
+                        yield doc
+                    continue
+                if array_value == []:
+                    if should_preserve_null_and_empty:
+                        new_doc = _clone_along_path(doc, path_parts)
+                        path_accessor.delete(new_doc)
+                        yield new_doc
+                    continue
+                if isinstance(array_value, list):
+                    iter_array = enumerate(array_value)
+                else:
+                    iter_array = [(None, array_value)]
+                for index, field_item in iter_array:
+                    # Clone everything but the unwound array itself, which
+                    # is replaced by the current element; the clone owns
+                    # all of its containers, so the index field can be
+                    # written into it directly.
+                    new_doc = _clone_along_path(doc, path_parts)
+                    new_doc = path_accessor.set(new_doc, field_item)
+                    if include_array_index:
+                        new_doc = set_index(new_doc, index)
+                    yield new_doc
+
+        def _coalesce_stages(pipeline):
+            """Combine adjacent stages the way the server's optimizer does.
+
+            Consecutive $match stages become a single $and match,
+            consecutive $skip stages add up and consecutive $limit stages
+            keep the smallest limit, so each coalesced pair costs one
+            stage less. The input pipeline is left untouched.
+            """
+            stages = []
+            for stage in pipeline:
+                previous = stages[-1] if stages else None
+                if previous is not None and len(stage) == 1 == len(previous):
+                    if (
+                        "$match" in stage
+                        and "$match" in previous
+                        and isinstance(stage["$match"], dict)
+                        and isinstance(previous["$match"], dict)
+                    ):
+                        stages[-1] = {
+                            "$match": {
+                                "$and": [previous["$match"], stage["$match"]]
+                            }
+                        }
+                        continue
+                    if (
+                        "$skip" in stage
+                        and "$skip" in previous
+                        and isinstance(stage["$skip"], int)
+                        and isinstance(previous["$skip"], int)
+                    ):
+                        stages[-1] = {"$skip": previous["$skip"] + stage["$skip"]}
+                        continue
+                    if (
+                        "$limit" in stage
+                        and "$limit" in previous
+                        and isinstance(stage["$limit"], int)
+                        and isinstance(previous["$limit"], int)
+                    ):
+                        stages[-1] = {
+                            "$limit": min(previous["$limit"], stage["$limit"])
+                        }
+                        continue
+                stages.append(stage)
+            return stages
+
+        # Streamable stages chain lazily over this iterable; blocking stages
+        # (sorting, grouping, sampling...) materialize it into a list.
+        out_collection = self.find()
+        stages = _coalesce_stages(pipeline)
+        for stage_index, stage in enumerate(stages):
             for k, v in iteritems(stage):
                 if k == "$match":
-                    out_collection = [
-                        doc for doc in out_collection if filter_applies(v, doc)
-                    ]
+                    out_collection = filter(compile_filter(v), out_collection)
                 elif k == "$lookup":
                     for operator in ("let", "pipeline"):
                         if operator in stage["$lookup"]:
@@ -1911,22 +2647,28 @@ class Collection(object):
                     foreign_field = stage["$lookup"]["foreignField"]
                     local_name = stage["$lookup"]["as"]
                     foreign_collection = self.database.get_collection(foreign_name)
-                    for doc in out_collection:
-                        query = doc.get(local_field)
-                        if isinstance(query, list):
-                            query = {"$in": query}
-                        matches = foreign_collection.find({foreign_field: query})
-                        doc[local_name] = [foreign_doc for foreign_doc in matches]
+                    out_collection = _lookup_documents(
+                        out_collection,
+                        foreign_collection,
+                        local_field,
+                        foreign_field,
+                        local_name,
+                    )
                 elif k == "$group":
                     grouped_collection = []
                     _id = stage["$group"]["_id"]
                     if _id:
-                        key_getter = functools.partial(aggregate.parse_expression, _id)
-                        sort_key_getter = _fix_sort_key(key_getter)
-                        # Sort the collection only for the itertools.groupby.
-                        # $group does not order its output document.
-                        out_collection = sorted(out_collection, key=sort_key_getter)
-                        grouped = itertools.groupby(out_collection, key_getter)
+                        key_getter = aggregate.compile_expression(_id)
+                        # Hash the group keys in a single pass rather than
+                        # sorting for itertools.groupby: $group does not
+                        # order its output documents anyway.
+                        groups = _ordered_dict()
+                        for doc in out_collection:
+                            doc_id = key_getter(doc)
+                            groups.setdefault(
+                                _make_hashable(doc_id), (doc_id, [])
+                            )[1].append(doc)
+                        grouped = itervalues(groups)
                     else:
                         grouped = [(None, out_collection)]
 
@@ -1986,6 +2728,8 @@ class Collection(object):
                                 "an input, and no default was specified."
                             )
 
+                    group_by_getter = aggregate.compile_expression(group_by)
+
                     def _get_bucket_id(doc):
                         """Get the bucket ID for a document.
 
@@ -1994,7 +2738,7 @@ class Collection(object):
                         if it's not the same type as the boundaries.
                         """
                         try:
-                            value = aggregate.parse_expression(group_by, doc)
+                            value = group_by_getter(doc)
                         except KeyError:
                             return (is_default_last, _get_default_bucket())
                         index = bisect.bisect_right(boundaries, value)
@@ -2002,17 +2746,19 @@ class Collection(object):
                             return (False, boundaries[index - 1])
                         return (is_default_last, _get_default_bucket())
 
-                    in_collection = (
-                        (_get_bucket_id(doc), doc) for doc in out_collection
-                    )
-                    out_collection = sorted(in_collection, key=lambda kv: kv[0])
-                    grouped = itertools.groupby(out_collection, lambda kv: kv[0])
+                    # Bucket in a single pass; only the handful of bucket
+                    # keys gets sorted for the output order, not the whole
+                    # collection.
+                    buckets = {}
+                    for doc in out_collection:
+                        buckets.setdefault(_get_bucket_id(doc), []).append(doc)
 
                     out_collection = []
-                    for (unused_key, doc_id), group in grouped:
-                        group_list = [kv[1] for kv in group]
-                        doc_dict = _accumulate_group(output_fields, group_list)
-                        doc_dict["_id"] = doc_id
+                    for bucket_key in sorted(buckets):
+                        doc_dict = _accumulate_group(
+                            output_fields, buckets[bucket_key]
+                        )
+                        doc_dict["_id"] = bucket_key[1]
                         out_collection.append(doc_dict)
 
                 elif k == "$sample":
@@ -2027,25 +2773,43 @@ class Collection(object):
                         raise OperationFailure(
                             "unrecognized option to $sample: %s" % set(v).pop()
                         )
-                    out_collection = [
-                        _random.choice(out_collection) for i in range(size)
-                    ]
+                    # Reservoir sampling: one pass over the stream, no
+                    # materialization, each document kept with equal
+                    # probability. Like the server, documents are sampled
+                    # without replacement and fewer than 'size' documents
+                    # are returned when the input is smaller.
+                    reservoir = []
+                    for index, doc in enumerate(out_collection):
+                        if index < size:
+                            reservoir.append(doc)
+                        else:
+                            slot = _random.randint(0, index)
+                            if slot < size:
+                                reservoir[slot] = doc
+                    _random.shuffle(reservoir)
+                    out_collection = reservoir
 
                 elif k == "$sort":
-                    sort_array = []
-                    for x, y in v.items():
-                        sort_array.append({x: y})
-                    for sort_pair in reversed(sort_array):
-                        for sortKey, sortDirection in sort_pair.items():
-                            out_collection = sorted(
-                                out_collection,
-                                key=lambda x: _resolve_sort_key(sortKey, x),
-                                reverse=sortDirection < 0,
-                            )
+                    # $sort directly followed by $limit only needs the top
+                    # 'limit' documents, not a full ordering.
+                    sort_limit = None
+                    if stage_index + 1 < len(stages):
+                        next_limit = stages[stage_index + 1].get("$limit")
+                        if isinstance(next_limit, int) and not isinstance(
+                            next_limit, bool
+                        ) and next_limit > 0:
+                            sort_limit = next_limit
+                    out_collection = _sort_by_composite_key(
+                        out_collection,
+                        list(v),
+                        list(v.values()),
+                        _resolve_sort_key,
+                        limit=sort_limit,
+                    )
                 elif k == "$skip":
-                    out_collection = out_collection[v:]
+                    out_collection = itertools.islice(out_collection, v, None)
                 elif k == "$limit":
-                    out_collection = out_collection[:v]
+                    out_collection = itertools.islice(out_collection, v)
                 elif k == "$unwind":
                     if not isinstance(v, dict):
                         v = {"path": v}
@@ -2055,42 +2819,14 @@ class Collection(object):
                             "$unwind failed: exception: field path references must be prefixed "
                             "with a '$' '%s'" % path
                         )
-                    path = path[1:]
-                    should_preserve_null_and_empty = v.get("preserveNullAndEmptyArrays")
-                    include_array_index = v.get("includeArrayIndex")
-                    unwound_collection = []
-                    for doc in out_collection:
-                        try:
-                            array_value = get_value_by_dot(doc, path)
-                        except KeyError:
-                            if should_preserve_null_and_empty:
-                                unwound_collection.append(doc)
-                            continue
-                        if array_value is None:
-                            if should_preserve_null_and_empty:
-                                unwound_collection.append(doc)
-                            continue
-                        if array_value == []:
-                            if should_preserve_null_and_empty:
-                                new_doc = copy.deepcopy(doc)
-                                delete_value_by_dot(new_doc, path)
-                                unwound_collection.append(new_doc)
-                            continue
-                        if isinstance(array_value, list):
-                            iter_array = enumerate(array_value)
-                        else:
-                            iter_array = [(None, array_value)]
-                        for index, field_item in iter_array:
-                            new_doc = copy.deepcopy(doc)
-                            new_doc = set_value_by_dot(new_doc, path, field_item)
-                            if include_array_index:
-                                new_doc = set_value_by_dot(
-                                    new_doc, include_array_index, index
-                                )
-                            unwound_collection.append(new_doc)
-
-                    out_collection = unwound_collection
+                    out_collection = _unwind_documents(
+                        out_collection,
+                        path[1:],
+                        v.get("preserveNullAndEmptyArrays"),
+                        v.get("includeArrayIndex"),
+                    )
                 elif k == "$project":
+                    out_collection = list(out_collection)
                     filter_list = []
                     method = None
                     include_id = v.get("_id")
@@ -2120,18 +2856,32 @@ class Collection(object):
                             filter_list.append(field)
                     if (method == "include") == (include_id is not False):
                         filter_list.append("_id")
-                    out_collection = [
-                        {
-                            k: v
-                            for (k, v) in x.items()
-                            if (method == "include") == (k in filter_list)
-                        }
-                        for x in out_collection
-                    ]
+                    # Decide include/exclude once and use set membership
+                    # rather than re-evaluating both per key per document.
+                    field_set = frozenset(filter_list)
+                    if method == "include":
+                        out_collection = [
+                            {
+                                key: value
+                                for key, value in x.items()
+                                if key in field_set
+                            }
+                            for x in out_collection
+                        ]
+                    else:
+                        out_collection = [
+                            {
+                                key: value
+                                for key, value in x.items()
+                                if key not in field_set
+                            }
+                            for x in out_collection
+                        ]
                 elif k == "$out":
                     # TODO(MetrodataTeam): should leave the origin collection unchanged
+                    out_collection = list(out_collection)
                     collection = self.database.get_collection(v)
-                    if collection.count() > 0:
+                    if collection._documents:
                         collection.drop()
                     collection.insert_many(out_collection)
                 else:
@@ -2146,6 +2896,10 @@ class Collection(object):
                             "See http://docs.mongodb.org/manual/meta/aggregation-quick-reference/ "
                             "for a complete list of valid operators." % k
                         )
+        if not isinstance(out_collection, list):
+            # Materialize any pending lazy stages so per-document errors
+            # surface here rather than while iterating the returned cursor.
+            out_collection = list(out_collection)
         return CommandCursor(out_collection)
 
     def with_options(self, **kwargs):
@@ -2199,7 +2953,113 @@ class Collection(object):
         return BulkWriteResult(bulk.execute(), True)
 
 
+def _clone_spine_level(container, spine_key):
+    """Copy one container, deep-cloning every value but the spine child."""
+    if isinstance(container, dict):
+        return {
+            key: value if key == spine_key else _fast_clone(value)
+            for key, value in iteritems(container)
+        }
+    return [
+        value if position == spine_key else _fast_clone(value)
+        for position, value in enumerate(container)
+    ]
+
+
+def _clone_along_path(doc, path_parts):
+    """Clone a document, sharing only the leaf of a dotted path.
+
+    Containers along the path get fresh dict/list copies so writing the
+    leaf cannot leak into the source document; everything off the path is
+    rebuilt with _fast_clone, which shares only immutable values, so
+    clones of the same source never alias each other through a mutable
+    sibling subtree. Used by $unwind, where skipping the clone of the
+    unwound array itself (immediately overwritten per element) is the
+    main saving.
+    """
+    part = path_parts[0]
+    if isinstance(doc, list):
+        try:
+            part = int(part)
+            child = doc[part]
+        except (ValueError, IndexError):
+            return _fast_clone(doc)
+    elif isinstance(doc, dict):
+        child = doc.get(part)
+    else:
+        return _fast_clone(doc)
+    if len(path_parts) == 1:
+        # The leaf value is overwritten or deleted by the caller right
+        # after the clone, so only its siblings need copying.
+        return _clone_spine_level(doc, part)
+    if not isinstance(child, (dict, list)):
+        return _fast_clone(doc)
+    cloned = _clone_spine_level(doc, part)
+    cloned[part] = _clone_along_path(child, path_parts[1:])
+    return cloned
+
+
+def _sort_by_composite_key(documents, sort_keys, directions, resolve, limit=None):
+    """Sort documents once on a composite key instead of once per key.
+
+    Decorate-sort-undecorate: every document's keys are resolved a single
+    time up front. Uniform directions sort on plain tuples; mixed
+    directions go through a comparator applying each key's direction,
+    which is equivalent to successive stable per-key sorts.
+
+    With a limit, only the top 'limit' documents are kept via a heap
+    (stable, like slicing the full sort) instead of ordering everything.
+    """
+    if len(sort_keys) == 1:
+        # Single-field sorts (the common case) compare resolved keys
+        # directly instead of wrapping each one in a 1-tuple.
+        single_key = sort_keys[0]
+        decorated = ((resolve(single_key, document), document) for document in documents)
+    else:
+        decorated = (
+            (tuple(resolve(sort_key, document) for sort_key in sort_keys), document)
+            for document in documents
+        )
+    if all(direction == directions[0] for direction in directions):
+        if limit is not None:
+            pick = heapq.nlargest if directions[0] < 0 else heapq.nsmallest
+            decorated = pick(limit, decorated, key=operator.itemgetter(0))
+        else:
+            decorated = sorted(
+                decorated, key=operator.itemgetter(0), reverse=directions[0] < 0
+            )
+    else:
+
+        def compare(left, right):
+            for left_key, right_key, direction in zip(left[0], right[0], directions):
+                if left_key < right_key:
+                    return -direction
+                if right_key < left_key:
+                    return direction
+            return 0
+
+        if limit is not None:
+            decorated = heapq.nsmallest(
+                limit, decorated, key=functools.cmp_to_key(compare)
+            )
+        else:
+            decorated = sorted(decorated, key=functools.cmp_to_key(compare))
+    return [document for unused_sort_key, document in decorated]
+
+
+def _groupby_hash(iterable, key_fn):
+    """Group items by key_fn in a single pass, keeping first-seen key order."""
+    buckets = _ordered_dict()
+    for item in iterable:
+        buckets.setdefault(key_fn(item), []).append(item)
+    return buckets.items()
+
+
 def _resolve_key(key, doc):
+    # Fast path for the common shape: a plain key on a dict document is a
+    # single lookup, with no candidate-list walk or iterator allocation.
+    if key and "." not in key and isinstance(doc, dict):
+        return doc.get(key, NOTHING)
     return next(iter(iter_key_candidates(key, doc)), NOTHING)
 
 
@@ -2224,6 +3084,29 @@ def _fix_sort_key(key_getter):
 
 
 class Cursor(object):
+    # A cursor is allocated for every find(); slots keep the instances
+    # small and make attribute access a fixed-offset load instead of a
+    # dict probe.
+    __slots__ = (
+        "collection",
+        "_spec",
+        "_sort",
+        "_projection",
+        "_skip",
+        "_limit",
+        "_collation",
+        "session",
+        "_factory",
+        "_factory_last_generated_results",
+        "_results",
+        "_results_window",
+        "_cached_count",
+        "_tz_aware",
+        "_emitted",
+        "_iterator",
+        "__empty",
+    )
+
     def __init__(
         self,
         collection,
@@ -2246,28 +3129,118 @@ class Cursor(object):
         self._skip = skip
         self._factory_last_generated_results = None
         self._results = None
-        self._factory = functools.partial(
-            collection._get_dataset, spec, sort, projection, dict
-        )
+        # Set by an empty __getitem__ slice; the cursor then yields nothing
+        # without ever running the query.
+        self.__empty = False
+        # (skip, limit) window the cached results were materialized with,
+        # or None when they cover the full result set.
+        self._results_window = None
+        self._cached_count = None
+        self._tz_aware = collection.database.client._tz_aware
+        self._factory = self._make_factory()
         # pymongo limit defaults to 0, returning everything
         self._limit = limit if limit != 0 else None
         self._collation = collation
         self.session = session
         self.rewind()
 
+    def _make_factory(self):
+        """Build the dataset factory for the current spec/sort/projection.
+
+        The filter predicate and projection are compiled lazily on first
+        use and reused across materializations of the same factory, so
+        repeated computations (count then fetch, windowed re-reads) do
+        not re-parse the query.
+        """
+        collection = self.collection
+        spec, sort, projection = self._spec, self._sort, self._projection
+        compiled = {}
+
+        def factory(skip=0, limit=0):
+            if not compiled:
+                compiled["matcher"] = compile_filter(spec)
+                compiled["projection"] = collection._compile_projection(projection)
+            return collection._get_dataset(
+                spec,
+                sort,
+                projection,
+                dict,
+                skip=skip,
+                limit=limit,
+                matcher=compiled["matcher"],
+                projection=compiled["projection"],
+            )
+
+        return factory
+
     def _compute_results(self, with_limit_and_skip=False):
-        # Recompute the result only if the query has changed
-        if not self._results or self._factory_last_generated_results != self._factory:
-            if self.collection.database.client._tz_aware:
-                results = [
-                    helpers.make_datetime_timezone_aware_in_document(x)
-                    for x in self._factory()
-                ]
+        if self.__empty:
+            return []
+        window = (self._skip, self._limit) if with_limit_and_skip else None
+        # Recompute the result only if the query or the materialized
+        # window has changed.
+        if (
+            not self._results
+            or self._factory_last_generated_results != self._factory
+            or self._results_window not in (None, window)
+        ):
+            use_window = (
+                window is not None
+                and (window[0] or window[1])
+                and window[0] >= 0
+                and (window[1] is None or window[1] > 0)
+            )
+            results_window = window if use_window else None
+            # Identical queries are re-run constantly in test suites;
+            # serve them from the collection's cleared-on-write cache when
+            # the query shape is hashable. Cached documents are cloned on
+            # both store and serve so cursors never alias each other.
+            collection = self.collection
+            cache = collection._query_cache if collection._copy_on_read else None
+            cache_key = None
+            if cache is not None:
+                try:
+                    cache_key = (
+                        _freeze_for_cache(self._spec),
+                        _freeze_for_cache(self._sort),
+                        _freeze_for_cache(self._projection),
+                        results_window,
+                        self._tz_aware,
+                    )
+                    hash(cache_key)
+                except TypeError:
+                    cache_key = None
+            cached = cache.get(cache_key) if cache_key is not None else None
+            if cached is not None:
+                results = [_fast_clone(document) for document in cached]
             else:
-                results = list(self._factory())
+                if use_window:
+                    # Push the window into the scan so skipped and overflow
+                    # rows are never projected or copied, and a sorted scan
+                    # can keep just the top skip+limit documents.
+                    skip, limit = window
+                    docs = self._factory(skip=skip, limit=limit or 0)
+                else:
+                    docs = self._factory()
+                if self._tz_aware:
+                    results = [
+                        helpers.make_datetime_timezone_aware_in_document(x)
+                        for x in docs
+                    ]
+                else:
+                    results = list(docs)
+                if cache_key is not None:
+                    cache[cache_key] = [_fast_clone(document) for document in results]
+                    while len(cache) > _QUERY_CACHE_SIZE:
+                        del cache[next(iter(cache))]
+            self._results_window = results_window
             self._factory_last_generated_results = self._factory
             self._results = results
-        if with_limit_and_skip:
+            if results_window is None:
+                self._cached_count = len(results)
+        if with_limit_and_skip and self._results_window is None and (
+            self._skip or self._limit
+        ):
             results = self._results[self._skip :]
             if self._limit:
                 results = results[: self._limit]
@@ -2291,34 +3264,71 @@ class Cursor(object):
         return cursor
 
     def __next__(self):
-        try:
-            doc = self._compute_results(with_limit_and_skip=True)[self._emitted]
-            self._emitted += 1
-            return doc
-        except IndexError:
-            raise StopIteration()
+        # Iterate over the computed results instead of re-slicing and
+        # indexing them for every document emitted.
+        if self._iterator is None:
+            iterator = iter(self._compute_results(with_limit_and_skip=True))
+            if self._emitted:
+                # The query changed mid-iteration; resume where the old
+                # list indexing would have, past the emitted documents.
+                iterator = itertools.islice(iterator, self._emitted, None)
+            self._iterator = iterator
+        doc = next(self._iterator)
+        self._emitted += 1
+        return doc
 
     next = __next__
 
     def rewind(self):
         self._emitted = 0
+        self._iterator = None
 
     def sort(self, key_or_list, direction=None):
         self._sort = helpers.create_index_list(key_or_list, direction)
-        self._factory = functools.partial(
-            self.collection._get_dataset, self._spec, self._sort, self._projection, dict)
+        self._factory = self._make_factory()
+        self._iterator = None
+        self._cached_count = None
         return self
 
     def count(self, with_limit_and_skip=False):
-        results = self._compute_results(with_limit_and_skip)
-        return len(results)
+        if self.__empty:
+            return 0
+        if with_limit_and_skip and (
+            self._skip < 0 or (self._limit is not None and self._limit < 0)
+        ):
+            # Negative skips and limits keep the slice-based path so the
+            # count always matches what iterating the cursor yields.
+            return len(self._compute_results(with_limit_and_skip))
+        # Serve the total from the cache; alive checks call this per
+        # iteration and must not re-run the query each time. A zero count
+        # stays uncached, like the empty-result cache above.
+        if not self._cached_count:
+            # Counting needs neither sort, projection nor document copies;
+            # run just the matcher over the store, like count_documents.
+            if not self._spec:
+                self._cached_count = len(self.collection._documents)
+            else:
+                self._cached_count = sum(
+                    1 for _ in self.collection._iter_documents(self._spec)
+                )
+        count = self._cached_count
+        if with_limit_and_skip:
+            # The window is pure arithmetic on the total; no need to
+            # materialize the windowed results just to take their length.
+            if self._skip:
+                count = max(0, count - self._skip)
+            if self._limit:
+                count = min(count, self._limit)
+        return count
 
     def skip(self, count):
         self._skip = count
+        self._iterator = None
         return self
 
     def limit(self, count):
         self._limit = count if count != 0 else None
+        self._iterator = None
         return self
 
     def batch_size(self, count):
@@ -2334,13 +3344,35 @@ class Cursor(object):
             raise TypeError("cursor.distinct key must be a string")
         unique = set()
         unique_dict_vals = []
+        seen_dict_keys = set()
+        # Inspect the key once instead of re-checking it for every document:
+        # a plain key on dict documents is a single lookup.
+        if key and "." not in key:
+
+            def resolve_value(doc):
+                return doc.get(key, NOTHING)
+
+        else:
+
+            def resolve_value(doc):
+                return _resolve_key(key, doc)
+
         for x in self._compute_results():
-            value = _resolve_key(key, x)
+            value = resolve_value(x)
             if value == NOTHING:
                 continue
             if isinstance(value, dict):
-                if any(dict_val == value for dict_val in unique_dict_vals):
-                    continue
+                # Dedupe subdocuments by a hashable canonical form instead
+                # of comparing against every dict seen so far.
+                try:
+                    canonical = _make_hashable(value)
+                    if canonical in seen_dict_keys:
+                        continue
+                    seen_dict_keys.add(canonical)
+                except TypeError:
+                    # Not hashable all the way down; fall back to a scan.
+                    if any(dict_val == value for dict_val in unique_dict_vals):
+                        continue
                 unique_dict_vals.append(value)
             else:
                 unique.update(value if isinstance(value, (tuple, list)) else [value])
@@ -2377,6 +3409,7 @@ class Cursor(object):
 
             self._skip = skip
             self._limit = limit
+            self._iterator = None
             return self
         elif not isinstance(index, int):
             raise TypeError("index '%s' cannot be applied to Cursor instances" % index)
@@ -2398,11 +3431,12 @@ class Cursor(object):
 
 def _set_updater(doc, field_name, value):
     if isinstance(value, (tuple, list)):
-        value = copy.deepcopy(value)
+        value = _fast_clone(value)
     if isinstance(doc, dict):
         if BSON:
-            # bson validation
-            BSON.encode({field_name: value}, check_keys=True)
+            # bson validation, without serializing the value just to
+            # throw the bytes away
+            _validate_keys({field_name: value})
         doc[field_name] = value
 
 
@@ -2413,23 +3447,38 @@ def _unset_updater(doc, field_name, value):
 
 def _inc_updater(doc, field_name, value):
     if isinstance(doc, dict):
-        doc[field_name] = doc.get(field_name, 0) + value
+        try:
+            doc[field_name] += value
+        except KeyError:
+            # Still add to the implicit 0 so non-numeric values raise.
+            doc[field_name] = 0 + value
 
 
 def _max_updater(doc, field_name, value):
     if isinstance(doc, dict):
-        doc[field_name] = max(doc.get(field_name, value), value)
+        try:
+            current = doc[field_name]
+        except KeyError:
+            doc[field_name] = value
+        else:
+            if value > current:
+                doc[field_name] = value
 
 
 def _min_updater(doc, field_name, value):
     if isinstance(doc, dict):
-        doc[field_name] = min(doc.get(field_name, value), value)
+        try:
+            current = doc[field_name]
+        except KeyError:
+            doc[field_name] = value
+        else:
+            if value < current:
+                doc[field_name] = value
 
 
-def _sum_updater(doc, field_name, current, result):
+def _sum_updater(doc, field_name, value):
     if isinstance(doc, dict):
-        result = current + doc.get[field_name, 0]
-        return result
+        doc[field_name] = doc.get(field_name, 0) + value
 
 
 def _current_date_updater(doc, field_name, value):
@@ -1,8 +1,7 @@
-from collections import OrderedDict
-
 from . import CollectionInvalid
 from . import InvalidName
 from . import OperationFailure
+from .collection import _ordered_dict
 from .collection import Collection
 
 from six import string_types
@@ -66,14 +65,16 @@ class Database(object):
                 collection = next(
                     c for c in self._collections.values() if c is name_or_collection
                 )
-                collection._documents = OrderedDict()
+                collection._documents = _ordered_dict()
+                collection._invalidate_query_cache()
                 collection._force_created = False
                 collection.drop_indexes()
             else:
                 if name_or_collection in self._collections:
                     collection = self._collections.get(name_or_collection)
                     if collection:
-                        collection._documents = OrderedDict()
+                        collection._documents = _ordered_dict()
+                        collection._invalidate_query_cache()
                         collection._force_created = False
                         collection.drop_indexes()
         # EAFP paradigm
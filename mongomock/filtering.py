@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from .helpers import ObjectId, RE_TYPE
+from .helpers import lru_cache, ObjectId, RE_TYPE
 from . import OperationFailure
 
 import numbers
@@ -81,6 +81,227 @@ def filter_applies(search_filter, document):
     return True
 
 
+def compile_filter(search_filter):
+    """Compile a filter into a predicate function over documents.
+
+    The filter is parsed once up front, so callers matching many documents
+    against the same filter (e.g. a collection scan) avoid re-examining the
+    filter for every document. The returned predicate is equivalent to
+    ``filter_applies(search_filter, document)``.
+    """
+    if search_filter is None:
+        return lambda document: True
+    if isinstance(search_filter, ObjectId):
+        search_filter = {"_id": search_filter}
+
+    predicate = _compile_flat_filter(search_filter)
+    if predicate is not None:
+        return predicate
+
+    clauses = [
+        _compile_filter_clause(key, search)
+        for key, search in iteritems(search_filter)
+        if key != "$comment"
+    ]
+
+    def predicate(document):
+        return all(clause(document) for clause in clauses)
+
+    return predicate
+
+
+# Search values safe for the generated equality predicate: hashable (so the
+# code cache can key on them) and free of special matching rules such as
+# regexes, operator dicts, None-matches-missing or the ObjectId-in-list quirk.
+_EQ_CODEGEN_TYPES = (bool, int, float, datetime) + string_types
+
+# Comparison constants safe for the generated range predicate: plain numbers,
+# whose type bracketing reduces to a single number check on the document value.
+_CMP_CODEGEN_TYPES = (int, float)
+
+_CMP_CODEGEN_SYMBOLS = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+
+
+def _compile_flat_filter(search_filter):
+    """Generate a predicate for flat equality/range filters, or None.
+
+    Filters of the shape ``{field: literal, ...}``,
+    ``{field: {'$gt': number, ...}, ...}`` or ``{field: {'$in': [literal,
+    ...]}}`` with plain top-level keys compile down to one generated
+    function with no per-document operator dispatch at all. Anything
+    fancier returns None so the caller falls back to the generic clause
+    compiler.
+    """
+    items = []
+    for key, search in iteritems(search_filter):
+        if not isinstance(key, string_types) or "$" in key or "." in key:
+            return None
+        if isinstance(search, _EQ_CODEGEN_TYPES):
+            items.append((key, None, search))
+            continue
+        if (
+            isinstance(search, dict)
+            and search
+            and all(
+                op_string in _CMP_CODEGEN_SYMBOLS
+                and isinstance(search_val, _CMP_CODEGEN_TYPES)
+                and not isinstance(search_val, bool)
+                for op_string, search_val in iteritems(search)
+            )
+        ):
+            items.append((key, tuple(iteritems(search)), None))
+            continue
+        if (
+            isinstance(search, dict)
+            and list(search) == ["$in"]
+            and isinstance(search["$in"], list)
+            and all(
+                element is None or isinstance(element, _EQ_CODEGEN_TYPES)
+                for element in search["$in"]
+            )
+        ):
+            items.append((key, (("$in", tuple(search["$in"])),), None))
+            continue
+        return None
+    return _codegen_flat_predicate(tuple(items))
+
+
+@lru_cache(maxsize=512)
+def _codegen_flat_predicate(items):
+    """Build and exec the source of a flat-filter predicate over documents.
+
+    Equality checks inline the two ways a literal matches in
+    ``filter_applies``: plain equality, or membership when the document
+    value is an array. Range checks inline the comparison operators' type
+    bracketing (only number-against-number compares, expanded over array
+    values) plus the fallback of the document value equaling the operator
+    dict itself.
+    """
+    lines = ["def predicate(d):"]
+    constants = []
+    searches = []
+    for key, ops, search in items:
+        lines.append("    v = d.get(%r, NOTHING)" % key)
+        if ops is None:
+            index = len(constants)
+            constants.append(search)
+            lines.append(
+                "    if not (v == c[%d] or (isinstance(v, (list, tuple)) and c[%d] in v)):"
+                % (index, index)
+            )
+        else:
+            conditions = []
+            if ops[0][0] != "$in":
+                lines.append(
+                    "    n = v.__class__ is not bool and isinstance(v, Number)"
+                )
+            for op_string, search_val in ops:
+                index = len(constants)
+                if op_string == "$in":
+                    # Mirror _in_op without per-document regex scanning:
+                    # scalars test membership directly, arrays expand per
+                    # element, and a None constant also matches absence.
+                    constants.append(search_val)
+                    condition = (
+                        "(any(e in c[%d] for e in v) "
+                        "if isinstance(v, (list, tuple)) else v in c[%d])"
+                        % (index, index)
+                    )
+                    if None in search_val:
+                        condition = "(v is NOTHING or %s)" % condition
+                    conditions.append(condition)
+                    continue
+                constants.append(search_val)
+                symbol = _CMP_CODEGEN_SYMBOLS[op_string]
+                conditions.append(
+                    "(n and v %s c[%d] or isinstance(v, list) and any("
+                    "e.__class__ is not bool and isinstance(e, Number) and e %s c[%d] "
+                    "for e in v))" % (symbol, index, symbol, index)
+                )
+            search_index = len(searches)
+            searches.append(
+                {
+                    op_string: list(value) if op_string == "$in" else value
+                    for op_string, value in ops
+                }
+            )
+            lines.append(
+                "    if not (%s or v == s[%d]):"
+                % (" and ".join(conditions), search_index)
+            )
+        lines.append("        return False")
+    lines.append("    return True")
+    namespace = {
+        "NOTHING": NOTHING,
+        "Number": numbers.Number,
+        "c": tuple(constants),
+        "s": tuple(searches),
+    }
+    exec("\n".join(lines), namespace)
+    return namespace["predicate"]
+
+
+def _compile_filter_clause(key, search):
+    """Compile a single key/search pair of a filter into a closure.
+
+    All decisions that depend only on the filter (operator lookups, the
+    $ne/$exists shortcut, the search value's type) are made here instead of
+    once per document.
+    """
+    search_is_dict = isinstance(search, dict)
+    ne_shortcut = search_is_dict and ("$ne" in search or search == {"$exists": False})
+    operators = (
+        [
+            (OPERATOR_MAP.get(op_string), op_string, search_val)
+            for op_string, search_val in iteritems(search)
+        ]
+        if search_is_dict
+        else None
+    )
+    search_is_re = isinstance(search, RE_TYPE)
+    search_is_object_id = isinstance(search, ObjectId)
+    logical_op = LOGICAL_OPERATOR_MAP.get(key)
+
+    def clause(document):
+        candidates = iter_key_candidates(key, document)
+        if ne_shortcut and not candidates:
+            return True
+        for doc_val in candidates:
+            if search_is_dict:
+                is_match = (
+                    all(
+                        op_fn is not None
+                        and op_fn(doc_val, search_val)
+                        or op_string == "$not"
+                        and _not_op(document, key, search_val)
+                        for op_fn, op_string, search_val in operators
+                    )
+                    and search
+                ) or doc_val == search
+            elif search_is_re and isinstance(doc_val, (string_types, list)):
+                is_match = _regex(doc_val, search)
+            elif logical_op is not None:
+                if not search:
+                    raise OperationFailure(
+                        "BadValue $and/$or/$nor must be a nonempty array"
+                    )
+                is_match = logical_op(document, search)
+            elif isinstance(doc_val, (list, tuple)):
+                is_match = search in doc_val or search == doc_val
+                if search_is_object_id:
+                    is_match |= str(search) in doc_val
+            else:
+                is_match = (doc_val == search) or (
+                    search is None and doc_val is NOTHING
+                )
+
+            if is_match:
+                return True
+        return False
+
+    return clause
+
+
 def iter_key_candidates(key, doc):
     """Get possible subdocuments or lists that are referred to by the key in question
 
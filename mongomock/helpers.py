@@ -17,6 +17,33 @@ except ImportError:
 # Cache the RegExp pattern type.
 RE_TYPE = type(re.compile(""))
 
+# functools.lru_cache does not exist on Python 2, so fall back to a small
+# dict-based memoizer there. It evicts by clearing the whole cache once full
+# instead of by recency, which is good enough for the small, hot key sets
+# (dotted paths, projection specs, filter shapes) cached through it.
+try:
+    from functools import lru_cache  # pylint: disable=unused-import
+except ImportError:
+
+    def lru_cache(maxsize=128):
+        def decorator(function):
+            cache = {}
+
+            def wrapper(*args):
+                try:
+                    return cache[args]
+                except KeyError:
+                    if maxsize is not None and len(cache) >= maxsize:
+                        cache.clear()
+                    result = function(*args)
+                    cache[args] = result
+                    return result
+
+            wrapper.cache_clear = cache.clear
+            return wrapper
+
+        return decorator
+
 try:
     from bson.tz_util import utc
 except ImportError:
@@ -284,18 +311,43 @@ def inplace_patch_datetime_awareness_in_document(doc):
         doc[key] = patch_datetime_awareness_in_document(doc)
 
 
+def _needs_datetime_patching(value):
+    """Check whether a value holds a datetime or tuple anywhere in its tree.
+
+    Cheap allocation-free pre-check so documents that need neither
+    datetime fixups nor tuple-to-list normalization skip the patching
+    rebuild entirely. Tuples count because the rebuild is also what turns
+    them into lists, the only form the store and its copy helpers handle.
+    """
+    if isinstance(value, datetime):
+        return True
+    if isinstance(value, dict):
+        return any(_needs_datetime_patching(v) for v in value.values())
+    if isinstance(value, tuple):
+        return True
+    if isinstance(value, list):
+        return any(_needs_datetime_patching(item) for item in value)
+    return False
+
+
 def patch_datetime_awareness_in_document(value):
     # MongoDB is supposed to stock everything as timezone naive utc date
     # Hence we have to convert incoming datetimes to avoid errors while
     # mixing tz aware and naive.
     # On top of that, MongoDB date precision is up to millisecond, where Python
     # datetime use microsecond, so we must lower the precision to mimic mongo.
+    if not _needs_datetime_patching(value):
+        return value
+    return _patch_datetime_awareness(value)
+
+
+def _patch_datetime_awareness(value):
     if isinstance(value, (dict, OrderedDict)):
         return type(value)(
-            (k, patch_datetime_awareness_in_document(v)) for k, v in value.items()
+            (k, _patch_datetime_awareness(v)) for k, v in value.items()
         )
     if isinstance(value, (tuple, list)):
-        return [patch_datetime_awareness_in_document(item) for item in value]
+        return [_patch_datetime_awareness(item) for item in value]
     if isinstance(value, datetime):
         mongo_us = (value.microsecond // 1000) * 1000
         if value.tzinfo:
@@ -10,6 +10,7 @@ from unittest import TestCase, skipIf
 import warnings
 
 import mongomock
+from mongomock.collection import _ordered_dict
 from mongomock.write_concern import WriteConcern
 
 try:
@@ -110,9 +111,9 @@ class CollectionAPITest(TestCase):
         qr = col.find({"_id": r})
         self.assertEqual(qr.count(), 1)
 
-        self.assertTrue(isinstance(col._documents, OrderedDict))
+        self.assertTrue(isinstance(col._documents, _ordered_dict))
         self.db.drop_collection(col)
-        self.assertTrue(isinstance(col._documents, OrderedDict))
+        self.assertTrue(isinstance(col._documents, _ordered_dict))
         qr = col.find({"_id": r})
         self.assertEqual(qr.count(), 0)
 
@@ -325,9 +326,10 @@ class CollectionAPITest(TestCase):
             self.assert_document_stored(doc_id, documents[i])
 
     def test__insert_many_with_generator(self):
-        documents = (doc for doc in [{'a': 1}, {'b': 2}])
-        result = self.db.collection.insert_many(documents)
+        documents = [{'a': 1}, {'b': 2}]
+        result = self.db.collection.insert_many(doc for doc in documents)
         self.assertIsInstance(result.inserted_ids, list)
+        self.assertEqual(len(result.inserted_ids), len(documents))
 
         for i, doc_id in enumerate(result.inserted_ids):
             self.assert_document_stored(doc_id, documents[i])